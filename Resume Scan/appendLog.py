@@ -0,0 +1,76 @@
+import json
+import os
+
+class AppendLog:
+    """
+    Rows split across two append-only files: fixed-size binary rows (dataPath)
+    and one JSON line per row (linesPath). Used by the resume index and the
+    score store.
+
+    Each append writes the binary rows first and the JSON lines second, so an
+    interrupted append leaves at most a torn tail. A row only counts once it
+    is complete in both files. Reading never modifies the files; only the
+    writer trims a torn tail (truncate) before appending again.
+    """
+
+    def __init__(self, dataPath, linesPath, rowBytes=None):
+        self.dataPath = dataPath
+        self.linesPath = linesPath
+        self.rowBytes = rowBytes  #May be set later, e.g. once the embedding size is known
+        self.offsets = []  #Byte offset of each row's JSON line
+        self.end = 0       #Byte offset just past the last counted line
+        self.count = 0
+
+    def refresh(self, limit=None):
+        """
+        Pick up rows appended since the last call (by this or another process)
+        and return their records. Rows beyond limit (a committed row count kept
+        elsewhere) or missing from either file are left for a later call.
+        """
+        if not self.rowBytes or not os.path.exists(self.dataPath) or not os.path.exists(self.linesPath):
+            return []
+        available = os.path.getsize(self.dataPath) // self.rowBytes
+        if limit is not None:
+            available = min(available, limit)
+
+        records = []
+        if available <= self.count:
+            return records
+        with open(self.linesPath, 'rb') as f:
+            f.seek(self.end)
+            for line in f:
+                if self.count + len(records) >= available or not line.endswith(b'\n'):
+                    break
+                records.append(json.loads(line))
+                self.offsets.append(self.end)
+                self.end += len(line)
+        self.count += len(records)
+        return records
+
+    def truncate(self):
+        """Drop anything past the counted rows (a torn append). Only the writer may call this."""
+        for path, size in ((self.dataPath, self.count * (self.rowBytes or 0)), (self.linesPath, self.end)):
+            if os.path.exists(path) and os.path.getsize(path) > size:
+                with open(path, 'r+b') as f:
+                    f.truncate(size)
+
+    def append(self, data, records):
+        """Append binary rows (rowBytes each) and one JSON line per record, binary first."""
+        with open(self.dataPath, 'ab') as f:
+            f.write(data)
+        with open(self.linesPath, 'ab') as f:
+            for record in records:
+                line = json.dumps(record).encode('utf-8') + b'\n'
+                f.write(line)
+                self.offsets.append(self.end)
+                self.end += len(line)
+        self.count += len(records)
+
+    def readRecords(self, rows):
+        """Records for the given row numbers, as {row: record}."""
+        records = {}
+        with open(self.linesPath, 'rb') as f:
+            for row in sorted(rows):
+                f.seek(self.offsets[row])
+                records[row] = json.loads(f.readline())
+        return records
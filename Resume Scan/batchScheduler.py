@@ -0,0 +1,91 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+#Scheduler config (override with environment variables)
+maxBatchSize = int(os.environ.get('ENCODE_MAX_BATCH', 32))
+maxWaitMs = float(os.environ.get('ENCODE_MAX_WAIT_MS', 5))
+
+class BatchScheduler:
+    """
+    Coalesces concurrent encode requests into one batched model call.
+
+    Callers block in encode(); a background thread collects pending texts for
+    up to maxWaitMs (or until maxBatchSize texts are waiting), runs encodeFn
+    once on all of them, and hands each caller back its own rows.
+    """
+
+    def __init__(self, encodeFn, maxBatchSize=maxBatchSize, maxWaitMs=maxWaitMs):
+        self.encodeFn = encodeFn
+        self.maxBatchSize = maxBatchSize
+        self.maxWait = maxWaitMs / 1000.0
+        self._pending = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.texts = 0
+
+    def _ensureThread(self):
+        #Threads don't survive fork, so check liveness rather than existence
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='encode-batcher', daemon=True)
+                self._thread.start()
+
+    def encode(self, texts):
+        """Encode texts as part of the next batch. Returns one embedding per text."""
+        texts = list(texts)
+        if not texts:
+            return []
+        self._ensureThread()
+        future = Future()
+        self._pending.put((texts, future))
+        return future.result()
+
+    def _collect(self):
+        """Block for the first request, then gather more until the batch is full or the wait expires."""
+        batch = [self._pending.get()]
+        size = len(batch[0][0])
+        deadline = time.monotonic() + self.maxWait
+        while size < self.maxBatchSize:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._pending.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            allTexts = [text for texts, _ in batch for text in texts]
+            try:
+                embeddings = self.encodeFn(allTexts)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.texts += len(allTexts)
+
+            #Fan rows back out to each waiting caller
+            start = 0
+            for texts, future in batch:
+                future.set_result(embeddings[start:start + len(texts)])
+                start += len(texts)
+
+    def stats(self):
+        """Batch counters: batches run, texts encoded, mean batch size."""
+        return {
+            'batches': self.batches,
+            'texts': self.texts,
+            'meanBatchSize': self.texts / self.batches if self.batches else 0.0,
+            'pending': self._pending.qsize()
+        }
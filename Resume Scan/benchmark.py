@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""Benchmark the parse -> extract -> embed -> score pipeline stage by stage."""
+
+import argparse
+import hashlib
+import json
+import platform
+import random
+import sys
+import time
+import numpy as np
+import fitz
+import matcher
+import resumeParser
+from embeddingCache import EmbeddingCache
+from textCache import TextCache
+from resumeParser import extractTextFromBytes
+from taxonomy import getTaxonomy
+
+stageNames = ['extractTextFromPdf', 'extractKeywords', 'categorizeKeywords', 'encode', 'score']
+
+_fillerWords = (
+    "designed implemented services customers platform reliability latency pipeline migrated "
+    "delivered features owned roadmap partnered stakeholders improved throughput reduced costs "
+    "automated deployments monitoring dashboards incidents oncall mentored engineers reviewed "
+    "architecture database queries caching api endpoints integration unit coverage release"
+).split()
+
+class StubModel:
+    """Deterministic offline stand-in for SentenceTransformer: hashed bag-of-words vectors."""
+
+    def __init__(self, dim=384):
+        self.dim = dim
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True, **kwargs):
+        single = isinstance(texts, str)
+        texts = [texts] if single else texts
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                out[row, int(hashlib.md5(word.encode('utf-8')).hexdigest()[:8], 16) % self.dim] += 1.0
+        return out[0] if single else out
+
+def syntheticText(rng, words, skillRatio=0.15):
+    """Random resume/JD-like text of roughly `words` words, mixing taxonomy skills into filler."""
+    skills = sorted(term for terms in getTaxonomy().categories.values() for term in terms)
+    tokens = []
+    for i in range(words):
+        tokens.append(rng.choice(skills) if rng.random() < skillRatio else rng.choice(_fillerWords))
+        if i % 14 == 13:
+            tokens[-1] += "."
+    return " ".join(tokens)
+
+def syntheticPdf(text, pages):
+    """Build a multi-page PDF in memory with text spread evenly across pages."""
+    words = text.split()
+    perPage = max(1, -(-len(words) // pages))
+    doc = fitz.open()
+    for pageNum in range(pages):
+        page = doc.new_page()
+        pageWords = words[pageNum * perPage:(pageNum + 1) * perPage]
+        lines = [" ".join(pageWords[i:i + 12]) for i in range(0, len(pageWords), 12)]
+        page.insert_textbox(fitz.Rect(50, 50, 560, 800), "\n".join(lines), fontsize=8)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+def peakRssMb():
+    """Peak resident memory of this process in MB, or None where unsupported."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    #Linux reports KB, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def runBenchmark(iterations, resumeWords, jdWords, pages, seed):
+    """Time each stage on fresh synthetic documents. Returns {stage: [seconds, ...]}."""
+    rng = random.Random(seed)
+    jobDesc = syntheticText(rng, jdWords)
+    timings = {name: [] for name in stageNames}
+
+    #Measure the model and the parser, not the caches (and keep synthetic PDFs out of .cache)
+    matcher._embeddingCache = EmbeddingCache(directory=None, maxMemoryEntries=0)
+    resumeParser._textCache = TextCache(directory=None, maxMemoryEntries=0)
+
+    #Warm up: model load, taxonomy load and first-call overheads aren't per-request costs
+    matcher.getMatchScore(jobDesc, syntheticText(rng, resumeWords))
+
+    jobKeywords = matcher.extractKeywords(jobDesc)
+    for _ in range(iterations):
+        pdfBytes = syntheticPdf(syntheticText(rng, resumeWords), pages)
+
+        start = time.perf_counter()
+        resumeText = extractTextFromBytes(pdfBytes)
+        timings['extractTextFromPdf'].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        resumeKeywords = matcher.extractKeywords(resumeText)
+        timings['extractKeywords'].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        matcher.categorizeKeywords(resumeKeywords)
+        timings['categorizeKeywords'].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        jobEmb, resumeEmb = matcher.embedDocuments([jobDesc, resumeText])
+        timings['encode'].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        semanticScore = float(matcher._cosineScores(jobEmb, resumeEmb[np.newaxis])[0])
+        matcher.combineScores(semanticScore, jobKeywords, resumeKeywords)
+        timings['score'].append(time.perf_counter() - start)
+
+    return timings
+
+def summarize(timings):
+    stages = {}
+    for name, samples in timings.items():
+        total = sum(samples)
+        stages[name] = {
+            'p50Ms': percentile(samples, 50) * 1000,
+            'p95Ms': percentile(samples, 95) * 1000,
+            'p99Ms': percentile(samples, 99) * 1000,
+            'meanMs': total / len(samples) * 1000,
+            'throughputPerSec': len(samples) / total if total else None
+        }
+    perDoc = [sum(values) for values in zip(*timings.values())]
+    stages['total'] = {
+        'p50Ms': percentile(perDoc, 50) * 1000,
+        'p95Ms': percentile(perDoc, 95) * 1000,
+        'p99Ms': percentile(perDoc, 99) * 1000,
+        'meanMs': sum(perDoc) / len(perDoc) * 1000,
+        'throughputPerSec': len(perDoc) / sum(perDoc)
+    }
+    return stages
+
+def compare(results, baseline, threshold):
+    """Stages whose p50 regressed by more than threshold (fraction) against baseline."""
+    regressions = []
+    for name, stats in results['stages'].items():
+        before = baseline.get('stages', {}).get(name)
+        if not before or not before['p50Ms']:
+            continue
+        change = (stats['p50Ms'] - before['p50Ms']) / before['p50Ms']
+        if change > threshold:
+            regressions.append((name, before['p50Ms'], stats['p50Ms'], change))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--iterations', type=int, default=50, help="Documents per run (default: 50)")
+    parser.add_argument('--resume-words', type=int, default=600, help="Words per synthetic resume (default: 600)")
+    parser.add_argument('--jd-words', type=int, default=250, help="Words in the synthetic job description (default: 250)")
+    parser.add_argument('--pages', type=int, default=2, help="Pages per synthetic PDF (default: 2)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--stub-model', action='store_true', help="Use a hashed bag-of-words model (offline, no torch)")
+    parser.add_argument('--out', default='bench_results.json', help="JSON results file (default: bench_results.json)")
+    parser.add_argument('--compare', help="Baseline results JSON; exit 1 if any stage's p50 regresses")
+    parser.add_argument('--threshold', type=float, default=0.2, help="Allowed p50 regression vs baseline (default: 0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    if args.iterations < 1 or args.pages < 1:
+        parser.error("--iterations and --pages must be positive")
+
+    if args.stub_model:
+        matcher._model = StubModel()
+
+    timings = runBenchmark(args.iterations, args.resume_words, args.jd_words, args.pages, args.seed)
+    results = {
+        'config': {
+            'iterations': args.iterations,
+            'resumeWords': args.resume_words,
+            'jdWords': args.jd_words,
+            'pages': args.pages,
+            'seed': args.seed,
+            'model': 'stub' if args.stub_model else matcher.modelKey
+        },
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'modelLoadSeconds': matcher.modelLoadSeconds
+        },
+        'stages': summarize(timings),
+        'peakRssMb': peakRssMb()
+    }
+
+    print(f"{'stage':<20}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'docs/sec':>12}")
+    for name, stats in results['stages'].items():
+        print(f"{name:<20}{stats['p50Ms']:>10.2f}{stats['p95Ms']:>10.2f}{stats['p99Ms']:>10.2f}"
+              f"{stats['throughputPerSec'] or 0:>12.1f}")
+    if results['peakRssMb'] is not None:
+        print(f"\nPeak RSS: {results['peakRssMb']:.1f} MB")
+
+    with open(args.out, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.out}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for name, before, after, change in regressions:
+            print(f"REGRESSION: {name} p50 {before:.2f}ms -> {after:.2f}ms (+{change * 100:.0f}%)")
+        if regressions:
+            sys.exit(1)
+        print(f"No p50 regressions over {args.threshold * 100:.0f}% against {args.compare}")
+
+if __name__ == '__main__':
+    main()
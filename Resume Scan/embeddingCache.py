@@ -0,0 +1,179 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+
+#Cache config (override with environment variables)
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+cacheDir = os.environ.get('EMBEDDING_CACHE_DIR', os.path.join(_BASE_DIR, '.cache', 'embeddings'))
+maxMemoryEntries = int(os.environ.get('EMBEDDING_CACHE_MEMORY_ENTRIES', 2048))
+maxDiskBytes = int(os.environ.get('EMBEDDING_CACHE_DISK_MB', 256)) * 1024 * 1024
+
+def normalizeText(text):
+    """Collapse whitespace so trivially different copies share a cache entry."""
+    return " ".join(text.split())
+
+def cacheKey(text, modelKey):
+    """Content address for an embedding: hash of model name plus normalized text."""
+    payload = modelKey + "\n" + normalizeText(text)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class EmbeddingCache:
+    """
+    Two-level embedding store: in-memory LRU in front of one .npy file per key on disk.
+
+    - Memory holds at most maxMemoryEntries embeddings (least recently used evicted)
+    - Disk is bounded by maxDiskBytes (oldest files evicted first)
+    - Pass directory=None for a memory-only cache
+
+    Subclasses store other values by overriding suffix, _prepare, _read and _write.
+    """
+
+    suffix = '.npy'
+
+    def __init__(self, directory=cacheDir, maxMemoryEntries=maxMemoryEntries, maxDiskBytes=maxDiskBytes):
+        self.directory = directory or None
+        self.maxMemoryEntries = maxMemoryEntries
+        self.maxDiskBytes = maxDiskBytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._diskBytes = None  #Computed on first write
+        self.memoryHits = 0
+        self.diskHits = 0
+        self.misses = 0
+
+    def _path(self, key):
+        #Fan out into subdirectories so no single directory gets huge
+        return os.path.join(self.directory, key[:2], key + self.suffix)
+
+    def _remember(self, key, embedding):
+        self._memory[key] = embedding
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxMemoryEntries:
+            self._memory.popitem(last=False)
+
+    def _prepare(self, value):
+        return np.asarray(value, dtype=np.float32)
+
+    def _read(self, path):
+        return np.load(path)
+
+    def _write(self, f, value):
+        np.save(f, value)
+
+    def get(self, key):
+        """Return the cached embedding for key, or None."""
+        with self._lock:
+            embedding = self._memory.get(key)
+            if embedding is not None:
+                self._memory.move_to_end(key)
+                self.memoryHits += 1
+                return embedding
+
+        if self.directory:
+            path = self._path(key)
+            try:
+                embedding = self._read(path)
+                os.utime(path)  #Mark as recently used for disk eviction
+            except (OSError, ValueError):
+                embedding = None
+            if embedding is not None:
+                with self._lock:
+                    self._remember(key, embedding)
+                    self.diskHits += 1
+                return embedding
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, embedding):
+        """Store an embedding in memory and on disk."""
+        embedding = self._prepare(embedding)
+        with self._lock:
+            self._remember(key, embedding)
+
+        if not self.directory:
+            return
+
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            #Write then rename so readers never see a partial file
+            tempPath = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tempPath, 'wb') as f:
+                self._write(f, embedding)
+            os.replace(tempPath, path)
+        except OSError:
+            #Disk cache is best effort, memory still has the entry
+            return
+
+        with self._lock:
+            if self._diskBytes is None:
+                self._diskBytes = self._scanDiskBytes()
+            else:
+                self._diskBytes += os.path.getsize(path)
+            overLimit = self._diskBytes > self.maxDiskBytes
+        if overLimit:
+            self._evictDisk()
+
+    def _listDiskFiles(self):
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith(self.suffix):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    files.append((stat.st_mtime, stat.st_size, path))
+        return files
+
+    def _scanDiskBytes(self):
+        return sum(size for _, size, _ in self._listDiskFiles())
+
+    def _evictDisk(self):
+        """Delete least recently used files until disk usage is back under 90% of the limit."""
+        files = sorted(self._listDiskFiles())
+        total = sum(size for _, size, _ in files)
+        target = self.maxDiskBytes * 0.9
+        for _, size, path in files:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        with self._lock:
+            self._diskBytes = total
+
+    def clear(self):
+        """Drop every entry from memory and disk and reset counters."""
+        with self._lock:
+            self._memory.clear()
+            self.memoryHits = self.diskHits = self.misses = 0
+        if self.directory:
+            for _, _, path in self._listDiskFiles():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            with self._lock:
+                self._diskBytes = 0
+
+    def stats(self):
+        """Hit/miss counters and sizes."""
+        with self._lock:
+            hits = self.memoryHits + self.diskHits
+            lookups = hits + self.misses
+            return {
+                'memoryHits': self.memoryHits,
+                'diskHits': self.diskHits,
+                'misses': self.misses,
+                'hitRatio': hits / lookups if lookups else 0.0,
+                'memoryEntries': len(self._memory),
+                'diskBytes': self._diskBytes
+            }
@@ -0,0 +1,57 @@
+"""
+Production server: the model is loaded once in the master process, then
+worker processes are forked and share it copy-on-write. With an ONNX backend
+each worker warms up its own model, and /readyz reports 503 until it has.
+
+    gunicorn -c gunicorn.conf.py server:app
+
+kill -HUP <master pid> restarts workers gracefully (in-flight requests finish).
+Code changes need a fresh master, see "Production Server" in the README.
+"""
+import gc
+import os
+
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+_cpuCount = os.cpu_count() or 1
+
+#Server config (override with environment variables)
+bind = os.environ.get('WEB_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('WEB_WORKERS', max(1, _cpuCount // 2)))
+threads = int(os.environ.get('WEB_THREADS', 4))  #Request threads per worker
+worker_class = 'gthread'
+timeout = int(os.environ.get('WEB_TIMEOUT', 120))
+graceful_timeout = int(os.environ.get('WEB_GRACEFUL_TIMEOUT', 30))
+max_requests = int(os.environ.get('WEB_MAX_REQUESTS', 0))  #Recycle a worker after this many requests (0 = never)
+max_requests_jitter = max_requests // 10
+preload_app = True
+chdir = _BASE_DIR
+
+#Inference threads per worker: split the cores between workers so they don't oversubscribe them
+inferenceThreads = int(os.environ.get('WEB_INFERENCE_THREADS', max(1, _cpuCount // workers)))
+
+#Workers share async task, OCR and job state through files
+os.environ.setdefault('SHARED_STATE_DIR', os.path.join(_BASE_DIR, '.cache', 'state'))
+#The model is loaded before forking (torch) or warmed up per worker (ONNX), never in the master's warm-up thread
+os.environ['MODEL_WARMUP'] = '0'
+
+def when_ready(arbiter):
+    #Runs in the master after the app is imported and before any worker is forked
+    import server as resumeServer
+    resumeServer.preload()
+    #Free import and preload garbage, then freeze what's left so no later collection, in the
+    #master or a worker, touches (and copies) the shared pages
+    gc.collect()
+    gc.freeze()
+    arbiter.log.info("Preloaded %s, forking %d workers x %d threads (%d inference threads each)",
+                     "model and taxonomy" if resumeServer.isModelLoaded() else "taxonomy (model loads per worker)",
+                     workers, threads, inferenceThreads)
+
+def post_fork(arbiter, worker):
+    import inferenceBackend
+    import server as resumeServer
+    inferenceBackend.inferenceThreads = inferenceThreads
+    if inferenceBackend.backend == 'torch':
+        inferenceBackend.setThreads(inferenceThreads)
+    else:
+        #Not preloaded in the master: load it now so the worker isn't routed traffic cold
+        resumeServer.startWarmup()
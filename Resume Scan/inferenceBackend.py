@@ -0,0 +1,111 @@
+import argparse
+import os
+import sys
+
+#Backend config (override with environment variables)
+backend = os.environ.get('EMBEDDING_BACKEND', 'torch')  #torch, onnx or onnx-int8
+onnxInt8File = os.environ.get('EMBEDDING_ONNX_INT8_FILE', 'onnx/model_quint8_avx2.onnx')
+inferenceThreads = int(os.environ.get('EMBEDDING_THREADS', 0))  #0 = library default
+parityTolerance = 0.02  #Max allowed score difference from the torch backend (0-1 scale)
+
+backends = ('torch', 'onnx', 'onnx-int8')
+
+def modelKey(modelName, backend=backend):
+    """Identifier for cached embeddings: quantized/exported backends don't share vectors with torch."""
+    return modelName if backend == 'torch' else f"{modelName}:{backend}"
+
+def setThreads(threads):
+    """Cap torch intra-op threads for this process (no-op for 0)."""
+    if threads:
+        import torch
+        torch.set_num_threads(threads)
+
+def loadSentenceTransformer(modelName, backend=backend, threads=None):
+    """
+    Load the embedding model on the selected backend.
+
+    - torch: the default PyTorch model
+    - onnx: ONNX Runtime on CPU (exported on first load if the repo has no ONNX file)
+    - onnx-int8: ONNX Runtime with a dynamically int8-quantized model file (onnxInt8File)
+
+    The ONNX backends need `pip install optimum[onnxruntime]`.
+    threads defaults to inferenceThreads (read at call time, so a forked worker can change it).
+    """
+    from sentence_transformers import SentenceTransformer
+
+    if threads is None:
+        threads = inferenceThreads
+
+    if backend == 'torch':
+        setThreads(threads)
+        return SentenceTransformer(modelName)
+
+    if backend not in backends:
+        raise ValueError(f"Unknown EMBEDDING_BACKEND {backend!r}, expected one of {', '.join(backends)}")
+
+    modelKwargs = {'provider': 'CPUExecutionProvider'}
+    if backend == 'onnx-int8':
+        modelKwargs['file_name'] = onnxInt8File
+    if threads:
+        import onnxruntime
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = threads
+        options.inter_op_num_threads = 1
+        modelKwargs['session_options'] = options
+
+    return SentenceTransformer(modelName, backend='onnx', model_kwargs=modelKwargs)
+
+def exportQuantizedModel(modelName, outputDir, config='avx2'):
+    """
+    Export an int8 dynamically quantized ONNX copy of modelName into outputDir.
+    Use it with EMBEDDING_BACKEND=onnx-int8 and EMBEDDING_ONNX_INT8_FILE pointing at the new file.
+    """
+    from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+
+    model = SentenceTransformer(modelName, backend='onnx')
+    model.save(outputDir)
+    export_dynamic_quantized_onnx_model(model, config, outputDir)
+
+#Representative pairs for the parity check
+_parityPairs = [
+    ("Looking for a Python developer with Django and PostgreSQL experience. Must know Docker and AWS.",
+     "Experienced Python developer. Worked with Django, Flask, PostgreSQL, MySQL. Familiar with Docker, Kubernetes, AWS, and Azure."),
+    ("Frontend engineer: React, TypeScript, Redux and modern CSS. Jest testing a plus.",
+     "Backend Java engineer focused on Spring Boot microservices, Kafka and Oracle databases."),
+    ("Data scientist with pandas, scikit-learn and SQL. Experience deploying models on GCP.",
+     "Machine learning engineer. Built pipelines in pandas and scikit-learn, served models with FastAPI on Google Cloud."),
+    ("DevOps engineer to run Kubernetes clusters with Terraform, Ansible and Prometheus.",
+     "Registered nurse with eight years of ICU experience and strong patient communication skills.")
+]
+
+def checkParity(modelName, backend=backend, pairs=None, tolerance=parityTolerance):
+    """
+    Compare cosine scores from backend against the torch backend on sample pairs.
+    Returns (passed, maxDifference, rows) where rows holds (torchScore, backendScore) per pair.
+    """
+    pairs = pairs or _parityPairs
+    texts = [text for pair in pairs for text in pair]
+
+    def pairScores(model):
+        embs = model.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+        return [float(embs[2 * i] @ embs[2 * i + 1]) for i in range(len(pairs))]
+
+    reference = pairScores(loadSentenceTransformer(modelName, backend='torch'))
+    candidate = pairScores(loadSentenceTransformer(modelName, backend=backend))
+    rows = list(zip(reference, candidate))
+    maxDifference = max(abs(a - b) for a, b in rows)
+    return maxDifference <= tolerance, maxDifference, rows
+
+if __name__ == '__main__':
+    from matcher import modelName
+
+    parser = argparse.ArgumentParser(description="Check an inference backend's scores against PyTorch.")
+    parser.add_argument('--backend', default=backend if backend != 'torch' else 'onnx', choices=backends)
+    parser.add_argument('--tolerance', type=float, default=parityTolerance)
+    args = parser.parse_args()
+
+    passed, maxDifference, rows = checkParity(modelName, backend=args.backend, tolerance=args.tolerance)
+    for torchScore, backendScore in rows:
+        print(f"torch {torchScore:.4f}  {args.backend} {backendScore:.4f}  diff {abs(torchScore - backendScore):.4f}")
+    print(f"{'PARITY_OK' if passed else 'PARITY_FAILED'}: max difference {maxDifference:.4f} (tolerance {args.tolerance})")
+    sys.exit(0 if passed else 1)
@@ -0,0 +1,148 @@
+import re
+
+#Candidate tokens: letters, digits and the punctuation tech terms use (c++, c#, .net, node.js, scikit-learn)
+_tokenPattern = re.compile(r'[a-z0-9+#.\-]+')
+
+#Characters that can't start or end a generic keyword
+_edgeChars = '+#.'
+
+#Distinct raw tokens remembered per engine before the memo is reset
+_maxTokenCache = 200000
+
+class KeywordEngine:
+    """
+    Precompiled keyword extractor and categorizer.
+
+    Built once from the category and stopword tables:
+    - an inverted term -> category lookup, so categorizing is one dict hit per keyword
+    - a token trie for multi-word terms (e.g. 'visual studio'), matched longest-first
+
+    extract() tokenizes with one regex pass, then resolves each distinct token
+    once (memoized across calls). Multi-word terms add a sequential scan only
+    when the text contains the first word of one.
+    """
+
+    def __init__(self, categories, stopwords, minKeywordLen, aliases=None):
+        self.categoryNames = list(categories)
+        self.stopwords = frozenset(stopwords)
+        self.minKeywordLen = minKeywordLen
+
+        #Term -> canonical keyword (aliases map onto the term they stand for)
+        self.canonical = {}
+        #Canonical keyword -> category, first category wins like the old nested loop
+        self.categoryOf = {}
+        for catName, catSet in categories.items():
+            for term in catSet:
+                self.categoryOf.setdefault(term, catName)
+                self.canonical.setdefault(term, term)
+        for alias, term in (aliases or {}).items():
+            self.canonical.setdefault(alias, term)
+
+        #Single-token terms are looked up directly, multi-token terms go in the trie
+        self.terms = {}
+        self.phrases = {}
+        self._tokenCache = {}
+        for term, target in self.canonical.items():
+            tokens = term.split()
+            if len(tokens) == 1:
+                if self._isMatchable(term):
+                    self.terms[term] = target
+            else:
+                node = self.phrases
+                for token in tokens:
+                    node = node.setdefault(token, {})
+                node[None] = target
+
+    def _isMatchable(self, term):
+        #Short plain words ('go', 'r') are too ambiguous in prose, keep the generic length rule for them
+        return len(term) >= self.minKeywordLen or not term.isalpha()
+
+    def _lookupTerm(self, token):
+        """Canonical taxonomy keyword for a raw token, or None."""
+        term = self.terms.get(token)
+        if term is None:
+            #Sentence punctuation around a term ('python.', 'node.js.', '-docker')
+            term = self.terms.get(token.rstrip('.-')) or self.terms.get(token.strip('.-'))
+        return term
+
+    def _genericKeywords(self, token):
+        """Yield generic keywords from a non-taxonomy token."""
+        token = token.strip('-' + _edgeChars)
+        if token in self.stopwords:
+            return
+        for part in token.split('-'):
+            part = part.strip(_edgeChars)
+            if part in self.terms:
+                yield self.terms[part]
+            elif (len(part) >= self.minKeywordLen and
+                    part not in self.stopwords and
+                    not part.isdigit()):
+                yield part
+
+    def _keywordsFor(self, token):
+        """Keywords produced by one raw token, memoized."""
+        keywords = self._tokenCache.get(token)
+        if keywords is None:
+            term = self._lookupTerm(token)
+            keywords = (term,) if term is not None else tuple(self._genericKeywords(token))
+            if len(self._tokenCache) >= _maxTokenCache:
+                self._tokenCache.clear()
+            self._tokenCache[token] = keywords
+        return keywords
+
+    def _extractWithPhrases(self, tokens):
+        """Sequential scan matching the longest multi-word term at each position."""
+        keywords = set()
+        phrases = self.phrases
+        i = 0
+        count = len(tokens)
+        while i < count:
+            token = tokens[i]
+            node = phrases.get(token.strip('.-'))
+            if node is not None:
+                match = None
+                end = i + 1
+                j = i + 1
+                while True:
+                    if None in node:
+                        match, end = node[None], j
+                    if j >= count:
+                        break
+                    node = node.get(tokens[j].strip('.-'))
+                    if node is None:
+                        break
+                    j += 1
+                if match is not None:
+                    keywords.add(match)
+                    i = end
+                    continue
+
+            keywords.update(self._keywordsFor(token))
+            i += 1
+        return keywords
+
+    def extract(self, text):
+        """Extract the set of keywords from text."""
+        tokens = _tokenPattern.findall(text.lower())
+        distinct = set(tokens)
+
+        if self.phrases and any(token.strip('.-') in self.phrases for token in distinct):
+            return self._extractWithPhrases(tokens)
+
+        keywords = set()
+        for token in distinct:
+            keywords.update(self._keywordsFor(token))
+        return keywords
+
+    def tokens(self, text):
+        """Raw candidate tokens of text, in order. extract(' '.join(tokens)) equals extract(text)."""
+        return _tokenPattern.findall(text.lower())
+
+    def categorize(self, keywords):
+        """Group keywords by category, with anything uncategorized under 'other'."""
+        result = {catName: set() for catName in self.categoryNames}
+        result['other'] = set()
+        categoryOf = self.categoryOf
+        for kw in keywords:
+            result[categoryOf.get(kw, 'other')].add(kw)
+        return result
@@ -1,7 +1,15 @@
 import sys
 import os
-from resumeParser import extractTextFromPdf
-from matcher import getMatchScore
+import argparse
+import csv
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import resumeParser
+from resumeParser import extractTextFromPdf, ocrTextFromPdf, ocrAvailable, pdfKey, cacheText
+from matcher import getMatchScore, compileJobDescription, scoreComponents, combineScores
+from scoreStore import ScoreStore
 
 def readMultilineInput(prompt):
     """Read multi-line input until empty line. Returns stripped text with newlines."""
@@ -31,6 +39,230 @@ def validateFilePath(path):
     
     return None 
 
+def _disableNestedParallelism():
+    """Pool initializer: files are already parsed in parallel, so parse each one serially."""
+    resumeParser.parallelWorkers = 1
+
+def parseResumeFile(path, ocr=False):
+    """
+    Validate and extract one resume. Returns (path, text, error) with the same error codes as interactive mode.
+    With ocr=True, image-only PDFs are OCR'd (already in a worker process) and the text is cached.
+    """
+    error = validateFilePath(path)
+    if error:
+        return path, None, error
+    
+    try:
+        resumeText = extractTextFromPdf(path)
+        if not resumeText.strip() and ocr:
+            resumeText = ocrTextFromPdf(path)
+            with open(path, 'rb') as f:
+                cacheText(pdfKey(f.read()), resumeText)
+    except Exception as e:
+        return path, None, f"PDF_PARSE_ERROR: failed to extract text from {path}: {e}"
+    
+    if not resumeText.strip():
+        hint = "OCR found no text either" if ocr else "Try --ocr or check if PDF is image-based"
+        return path, None, f"NO_TEXT_EXTRACTED: {path} contains no readable text. {hint}."
+    
+    return path, resumeText, None
+
+def _readRecords(outPath):
+    """Yield (record, raw line or CSV row) for each complete record in an existing output file."""
+    with open(outPath, newline='', encoding='utf-8') as f:
+        if outPath.lower().endswith('.csv'):
+            for row in csv.DictReader(f):
+                yield {'file': row['file'], 'score': row.get('score') or None}, row
+        else:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  #Partial line from an interrupted run
+                yield record, line
+
+def loadFinishedFiles(outPath):
+    """Returns (scored, failed): files with a score and files with only error records in an existing output file."""
+    scored = set()
+    failed = set()
+    if not os.path.exists(outPath):
+        return scored, failed
+    
+    for record, _ in _readRecords(outPath):
+        if record.get('score') is not None:
+            scored.add(record['file'])
+        else:
+            failed.add(record['file'])
+    return scored, failed - scored
+
+def dropFailedRecords(outPath):
+    """Rewrite outPath without its error records, so files about to be retried don't collect duplicates."""
+    if not os.path.exists(outPath):
+        return
+    
+    isCsv = outPath.lower().endswith('.csv')
+    tempPath = outPath + '.tmp'
+    with open(tempPath, 'w', newline='', encoding='utf-8') as out:
+        if isCsv:
+            csvWriter = csv.DictWriter(out, fieldnames=ResultWriter.fields)
+            csvWriter.writeheader()
+        for record, raw in _readRecords(outPath):
+            if record.get('score') is None:
+                continue
+            if isCsv:
+                csvWriter.writerow(raw)
+            else:
+                out.write(raw if raw.endswith('\n') else raw + '\n')
+    os.replace(tempPath, outPath)
+
+class ResultWriter:
+    """Appends result records to a JSONL or CSV file (chosen by extension), flushing after each batch."""
+    
+    fields = ['file', 'score', 'matched', 'missing', 'error']
+    
+    def __init__(self, outPath):
+        self.isCsv = outPath.lower().endswith('.csv')
+        isNew = not os.path.exists(outPath) or os.path.getsize(outPath) == 0
+        self.file = open(outPath, 'a', newline='', encoding='utf-8')
+        if self.isCsv:
+            self.csvWriter = csv.DictWriter(self.file, fieldnames=self.fields)
+            if isNew:
+                self.csvWriter.writeheader()
+    
+    def write(self, record):
+        if self.isCsv:
+            row = dict(record)
+            row['matched'] = ";".join(record['matched'])
+            row['missing'] = ";".join(record['missing'])
+            self.csvWriter.writerow(row)
+        else:
+            self.file.write(json.dumps(record) + "\n")
+    
+    def flush(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+    
+    def close(self):
+        self.file.close()
+
+def runBatch(jdPath, resumeDir, outPath, workers=None, batchSize=32, storeDir=None, ocr=False, retryFailed=False):
+    """
+    Score every PDF in resumeDir against the job description in jdPath.
+    
+    PDFs are parsed across a process pool, embedded batchSize at a time, and
+    results are appended to outPath as each batch completes. Files already
+    scored in outPath are skipped, so an interrupted run can simply be restarted.
+    Files that failed in an earlier run are skipped too, unless retryFailed is set;
+    their old error records are then removed before they are tried again.
+    With storeDir, score components are also saved there for scoreStore.py re-ranking.
+    With ocr, image-only PDFs are OCR'd instead of failing (needs Tesseract).
+    """
+    with open(jdPath, encoding='utf-8') as f:
+        jobDesc = f.read().strip()
+    if not jobDesc:
+        print(f"JOB_DESC_EMPTY: {jdPath} contains no text")
+        sys.exit(1)
+    
+    if not os.path.isdir(resumeDir):
+        print(f"DIR_NOT_FOUND: {resumeDir} is not a directory")
+        sys.exit(1)
+    
+    if ocr and not ocrAvailable():
+        print("OCR_UNAVAILABLE: --ocr needs Tesseract installed (set TESSDATA_PREFIX if it isn't found)")
+        sys.exit(1)
+    
+    store = None
+    if storeDir:
+        try:
+            store = ScoreStore(storeDir, jobDesc=jobDesc)
+        except ValueError as e:
+            print(f"STORE_MISMATCH: {e}")
+            sys.exit(1)
+    
+    allPaths = sorted(
+        os.path.join(resumeDir, name) for name in os.listdir(resumeDir)
+        if name.lower().endswith('.pdf')
+    )
+    scored, failed = loadFinishedFiles(outPath)
+    if retryFailed and failed:
+        dropFailedRecords(outPath)
+        failed = set()
+    paths = [path for path in allPaths if path not in scored and path not in failed]
+    skippedFailed = sum(1 for path in allPaths if path in failed)
+    retryHint = " (use --retry-failed)" if skippedFailed else ""
+    print(f"Found {len(allPaths)} PDFs, {len(allPaths) - len(paths) - skippedFailed} already scored, "
+          f"{skippedFailed} failed before{retryHint}, {len(paths)} to process", file=sys.stderr)
+    if not paths:
+        return
+    
+    writer = ResultWriter(outPath)
+    startTime = time.time()
+    processed = 0
+    failed = 0
+    
+    profile = compileJobDescription(jobDesc)
+    
+    def scoreBatch(batch):
+        semanticScores, resumeKeywords = scoreComponents(profile, [text for _, text in batch], batchSize=batchSize)
+        if store is not None:
+            store.addMany([path for path, _ in batch], [text for _, text in batch], semanticScores)
+        
+        jobKeywords, jobImportant = profile.keywords()
+        for (path, _), semanticScore, keywords in zip(batch, semanticScores, resumeKeywords):
+            score, matched, missing = combineScores(semanticScore, jobKeywords, keywords, jobImportant)
+            writer.write({
+                'file': path,
+                'score': round(score * 100, 1),
+                'matched': sorted(matched),
+                'missing': sorted(missing),
+                'error': None
+            })
+    
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_disableNestedParallelism) as pool:
+            batch = []
+            for path, resumeText, error in pool.map(partial(parseResumeFile, ocr=ocr), paths, chunksize=4):
+                processed += 1
+                if error:
+                    failed += 1
+                    writer.write({'file': path, 'score': None, 'matched': [], 'missing': [], 'error': error})
+                else:
+                    batch.append((path, resumeText))
+                
+                if len(batch) >= batchSize or processed == len(paths):
+                    if batch:
+                        scoreBatch(batch)
+                        batch = []
+                    writer.flush()
+                    elapsed = time.time() - startTime
+                    print(f"{processed}/{len(paths)} docs, {processed / elapsed:.1f} docs/sec", file=sys.stderr)
+    finally:
+        writer.close()
+    
+    elapsed = time.time() - startTime
+    print(f"Done: {processed - failed} scored, {failed} failed in {elapsed:.1f}s "
+          f"({processed / elapsed:.1f} docs/sec). Results in {outPath}", file=sys.stderr)
+
+def parseArgs(argv):
+    parser = argparse.ArgumentParser(
+        description="Score resumes against a job description. Run without arguments for interactive mode."
+    )
+    parser.add_argument('--jd', help="Path to a text file with the job description")
+    parser.add_argument('--resumes', help="Directory of resume PDFs to score")
+    parser.add_argument('--out', help="Output file, .jsonl or .csv (appended to, already-scored files are skipped)")
+    parser.add_argument('--workers', type=int, default=None, help="PDF parser processes (default: CPU count)")
+    parser.add_argument('--batch-size', type=int, default=32, help="Resumes per model batch (default: 32)")
+    parser.add_argument('--store', help="Also save score components here, for re-ranking with scoreStore.py")
+    parser.add_argument('--ocr', action='store_true', help="OCR image-only PDFs instead of failing them (needs Tesseract)")
+    parser.add_argument('--retry-failed', action='store_true', help="Retry files that failed in an earlier run of the same --out")
+    args = parser.parse_args(argv)
+    
+    if not (args.jd and args.resumes and args.out):
+        parser.error("batch mode needs --jd, --resumes and --out")
+    if args.batch_size < 1:
+        parser.error("--batch-size must be positive")
+    return args
+
 def main():
     #Read job description with multi-line support
     jobDesc = readMultilineInput(
@@ -51,9 +283,12 @@ def main():
         print(error)
         sys.exit(1)
     
-    #Extract text from PDF
+    #Extract text from PDF, falling back to OCR for image-only PDFs when Tesseract is installed
     try:
         resumeText = extractTextFromPdf(resumePath)
+        if not resumeText.strip() and ocrAvailable():
+            print("No text layer found, running OCR (this can take a while)...")
+            resumeText = ocrTextFromPdf(resumePath)
     except Exception as e:
         print(f"PDF_PARSE_ERROR: failed to extract text from {resumePath}: {e}")
         sys.exit(1)
@@ -92,4 +327,9 @@ def main():
         print("None")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if len(sys.argv) > 1:
+        args = parseArgs(sys.argv[1:])
+        runBatch(args.jd, args.resumes, args.out, workers=args.workers, batchSize=args.batch_size,
+                 storeDir=args.store, ocr=args.ocr, retryFailed=args.retry_failed)
+    else:
+        main()
\ No newline at end of file
@@ -1,179 +1,263 @@
-from sentence_transformers import SentenceTransformer, util
+import os
 import re
+import threading
+import time
+import numpy as np
+from embeddingCache import EmbeddingCache, cacheKey
+from batchScheduler import BatchScheduler
+import inferenceBackend
+import metrics
+from taxonomy import getTaxonomy
 
 #Model config
 modelName = 'all-MiniLM-L6-v2'
-minKeywordLen = 4
-
-#Stopwords to filter generic terms
-stopwords = {
-    # Core
-    'the','and','or','but','in','on','at','to','for','of','a','an','is','are','was','were','be','been',
-    'has','have','had','do','does','did','will','would','should','could','may','might','must','can',
-    'this','that','these','those','with','from','as','by','about','also','between','than','more','most',
-    'other','such','into','through','during','before','after','above','below','under','again','further',
-    'then','once','here','there','when','where','why','how','all','both','each','few','some','only','own',
-    'same','too','very','just','being','doing','having','out','up','down','over','off','while','because',
-    'if','so','nor','although','though','unless','until','since','ever','never','always','often','usually',
-    'sometimes','any','every','either','neither','within','without','across','around','near','per','via',
-    'who','whom','whose','which','what','whatever','whichever','it','its','itself','they','them','their',
-    'theirs','themselves','you','your','yours','yourself','yourselves','we','our','ours','ourselves','etc',
-    'already','another','else','everyone','still','someone','something','step','type','version','versions',
-    'want','works','writes','matched','matches','matched','applicable','applicant','applicants','applicable',
-
-    # Boilerplate
-    'objective','summary','profile','overview','experience','work','employment','history','responsibilities',
-    'responsibility','responsible','duties','tasks','tasked','role','roles','position','positions','project',
-    'projects','education','school','university','college','background','references','contact','address',
-    'phone','email','linkedin','portfolio','skills','skill','competencies','competency','abilities','ability',
-    'strengths','weaknesses','certification','certifications','license','licenses','seeking','looking',
-    'available','willing','relocate','relocation','remote','hybrid','onsite','authorized','authorization',
-    'eligible','eligibility','general','current','expected','designed','maintaining','managed','managing',
-    'lead','led','leading','support','supported','supporting','assisted','assisting','assist','help','helped',
-    'collaborate','collaborated','collaborating','coordinate','coordinated','coordinating','participate',
-    'participated','participating','involved','deliver','delivered','delivering','own','owned','owning',
-    'posting','contracts','contract','candidate','candidates','clearance','recommendations','recommended',
-    'recommend','recommending','participates','provides','processes','crucial','control','fit','fits',
-    'posting','perform','performs','performs','someone','something','restless',
-
-    # HR / Business / Resume Fluff
-    'accessible','accommodation','accommodations','action','activities','advanced','aggressive','agile',
-    'aiming','analytical','approach','aspirations','attend','automation','back','beautiful','behind',
-    'brands','bring','business','career','cases','category','centric','challenge','characteristic',
-    'clients','close','collected','color','comes','committed','company','connected','connection',
-    'consideration','convention','cost','creativity','creators','cultivating','daily','derive','desire',
-    'determination','directly','disabilities','disciplines','done','drinks','drive','driving','early','easy',
-    'employees','empowered','empowers','encouraged','encourages','equal','essential','events','exciting',
-    'exclusive','existing','explore','family','favorite','feedback','find','finding','focused','focuses',
-    'free','fresh','functionality','functioning','functions','gather','globally','going','government','grasp',
-    'group','grow','harness','hear','helps','hyper','identity','inclusion','incorporate','individuals',
-    'initiative','innovation','inside','insiders','insights','insurance','intelligence','interview','iterate',
-    'iterating','laws','leave','level','life','light','locations','love','lunches','meaning','meetings',
-    'mental','mind','mondays','month','months','move','national','needed','needs','nice','nimble','offices',
-    'ones','optimize','organizational','orientation','otherwise','outside','owns','paid','partnering',
-    'passing','peers','perks','person','personalized','persons','place','please','plus','polygraph','power',
-    'prioritize','privileges','problems','purposeful','promise','propose','protected','qualified','quarter',
-    'race','ready','real','reasonable','reasons','receive','recruiter','regard','reimbursement','relational',
-    'religion','requires','researchers','restricted','retail','rewarding','right','rights','risks','scope',
-    'scoping','scrum','small','simple','smaller','sorted','sorting','status','stock','stories','sure','step',
-    'strongly','supportive','sustain','sustained','synergy','systemic','tactical','takes','talent','teammates',
-    'technical','tech','thorough','together','traffic','trusted','typically','understand','understanding',
-    'united','user','value','values','varies','vision','views','visit','veteran','week','weeks','year','years',
-
-    # Filler verbs / generic actions
-    'boot','bugs','control','crucial','debating','depend','depends','dust','enhancing','estimates','gathering',
-    'good','ides','interact','interface','matched','melts','migrates','mold','posting','provides','ranging',
-    'recommendations','recommended','scheming','scope','settles','small','someone','something','still','step',
-    'substituted','tracking','type','upgrades','version','versions','want','works','writes',
-
-    # Time/date words
-    'january','february','march','april','may','june','july','august','september','october','november',
-    'december','jan','feb','mar','apr','jun','jul','aug','sep','sept','oct','nov','dec','monday','tuesday',
-    'wednesday','thursday','friday','saturday','sunday','mon','tue','tues','wed','thu','thur','thurs','fri',
-    'sat','sun','spring','summer','autumn','fall','winter','today','yesterday','tomorrow','weekly','monthly',
-    'quarterly','annually','yearly','present','previous','prior',
-
-    # Buzzwords/adjectives
-    'detail','detailed','detail-oriented','results','results-oriented','result','result-driven','driven',
-    'motivated','self-motivated','hardworking','dedicated','passionate','innovative','creative','dynamic',
-    'flexible','adaptable','proactive','strong','excellent','outstanding','proven','exceptional','extensive',
-    'multiple','several','numerous','various','effective','efficient','fast','quick','robust','scalable',
-    'best','top','highly','solid','deep','broad','team','teamwork','team-player','team-oriented','collaborative',
-    'cross-functional','communication','communicator','interpersonal','presentation','presentations',
-    'leadership','leader','mentorship','mentored','mentoring',
-
-    # Low value verbs
-    'use','used','using','make','makes','made','making','get','gets','got','getting','put','puts','putting',
-    'set','sets','setting','include','includes','including','included','implement','implemented','implementing',
-    'create','created','creating','build','built','building','develop','developed','developing','perform',
-    'performed','performing','conduct','conducted','conducting','apply','applied','applying','execute',
-    'executed','executing','ensure','ensured','ensuring','achieve','achieved','achieving','provide',
-    'provided','providing','handle','handled','handling','train','trained','training','analyze','analyzed',
-    'analyzing','prepare','prepared','preparing','plan','planned','planning','improve','improved','improving',
-    'increase','increased','increasing','reduce','reduced','reducing','test','tested','testing','document',
-    'documented','documenting','report','reported','reporting'
-}
-
-
-#Keyword categories
-categories = {
-    'languages': {
-        'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'ruby',
-        'php', 'swift', 'kotlin', 'go', 'rust', 'scala', 'perl', 'r',
-        'matlab', 'shell', 'bash', 'powershell', 'sql', 'html', 'css'
-    },
-    'frameworks': {
-        'react', 'angular', 'vue', 'django', 'flask', 'spring', 'node.js',
-        'express', 'fastapi', 'rails', 'laravel', '.net', 'asp.net',
-        'next.js', 'nuxt', 'gatsby', 'redux', 'tensorflow', 'pytorch',
-        'keras', 'scikit-learn', 'pandas', 'numpy', 'jquery', 'bootstrap',
-        'tailwind', 'material-ui'
-    },
-    'tools': {
-        'docker', 'kubernetes', 'git', 'jenkins', 'gitlab', 'github',
-        'jira', 'confluence', 'slack', 'aws', 'azure', 'gcp',
-        'terraform', 'ansible', 'puppet', 'chef', 'vagrant', 'webpack',
-        'babel', 'vite', 'nginx', 'apache', 'linux', 'unix', 'windows',
-        'macos', 'visual', 'vscode', 'intellij', 'eclipse', 'postman',
-        'grafana', 'prometheus', 'datadog', 'splunk', 'elasticsearch',
-        'kibana', 'logstash'
-    },
-    'databases': {
-        'postgresql', 'mysql', 'mongodb', 'redis', 'cassandra',
-        'dynamodb', 'oracle', 'sqlite', 'mariadb', 'sqlserver',
-        'neo4j', 'couchdb', 'firebase', 'firestore', 'memcached',
-        'influxdb', 'timescaledb', 'snowflake', 'bigquery', 'redshift'
-    }
-}
+modelKey = inferenceBackend.modelKey(modelName)  #Model + backend (EMBEDDING_BACKEND), keys cached embeddings
+
+#The model only reads ~256 word pieces, so longer texts are embedded as overlapping word windows
+chunkWords = 150
+chunkOverlap = 30
+chunkPooling = 'mean'  #'mean' or 'max' over a document's chunk embeddings
+
+#Score blend (override with environment variables)
+semanticWeight = float(os.environ.get('SCORE_SEMANTIC_WEIGHT', 0.6))
+keywordWeight = float(os.environ.get('SCORE_KEYWORD_WEIGHT', 1 - semanticWeight))
+
+#Requirement-level explanations (see explainMatch): sentences per side are capped so one
+#batched encode and one similarity matrix stay within the request latency budget
+maxRequirements = int(os.environ.get('EXPLAIN_MAX_REQUIREMENTS', 30))
+maxEvidence = int(os.environ.get('EXPLAIN_MAX_EVIDENCE', 150))
+sentenceMinWords = 3   #Shorter fragments (headings, dates) are dropped
+sentenceMaxWords = 40  #Longer runs (bullets lost in PDF extraction) are split into windows
+
+#Skill categories, aliases and stopwords are loaded from taxonomy/ (see taxonomy.py)
+
+#Sentence and bullet boundaries; extracted resume text has no line breaks, so bullet glyphs and spaced dashes count too
+_sentenceBoundary = re.compile(r'\n+|(?<=[.!?;])\s+|\s*[\u2022\u25cf\u25aa\u25a0\u25e6\u2023\u2043\u2219\u00b7\u27a2\u25ba\u25b8]\s*|\s+[-\u2013\u2014*]\s+')
 
 #Global model instance
 _model = None
+_modelLock = threading.Lock()
+modelLoadSeconds = None
+
+#Embeddings keyed by model + normalized text, shared by every scoring path
+_embeddingCache = EmbeddingCache()
+
+#Optional micro-batcher for concurrent callers (see enableMicroBatching)
+_scheduler = None
 
 def loadModel():
     """Lazy load the model on first use. Cached after first load."""
-    global _model
+    global _model, modelLoadSeconds
     if _model is None:
-        _model = SentenceTransformer(modelName)
+        with _modelLock:
+            if _model is None:
+                #Heavy imports happen in here, so keyword-only callers never pay for torch
+                start = time.perf_counter()
+                _model = inferenceBackend.loadSentenceTransformer(modelName)
+                modelLoadSeconds = time.perf_counter() - start
     return _model
 
-def extractKeywords(text):
-    """Extract meaningful keywords from text for matching."""
-    textLower = text.lower()
+def isModelLoaded():
+    """True once loadModel has finished."""
+    return _model is not None
+
+def warmUpModel():
+    """Load the model and run one throwaway encode so the first real request is fast."""
+    loadModel().encode(["warm up"], convert_to_numpy=True)
+
+def enableMicroBatching(maxBatchSize=None, maxWaitMs=None):
+    """
+    Route small encode calls through a BatchScheduler so concurrent requests
+    share one model forward pass. Intended for multi-threaded servers.
+    """
+    global _scheduler
+    kwargs = {}
+    if maxBatchSize is not None:
+        kwargs['maxBatchSize'] = maxBatchSize
+    if maxWaitMs is not None:
+        kwargs['maxWaitMs'] = maxWaitMs
+    _scheduler = BatchScheduler(
+        lambda texts: loadModel().encode(texts, batch_size=len(texts), convert_to_numpy=True),
+        **kwargs
+    )
+    return _scheduler
+
+def _encodeUncached(texts, batchSize):
+    #Large calls are already batched, only coalesce small ones
+    if _scheduler is not None and len(texts) < _scheduler.maxBatchSize:
+        return _scheduler.encode(texts)
+    return loadModel().encode(texts, batch_size=batchSize, convert_to_numpy=True)
+
+def encodeTexts(texts, batchSize=32):
+    """
+    Embed texts, returning a float32 matrix with one row per text.
+    Cached embeddings are reused; only misses are sent to the model, in one batched call.
+    """
+    with metrics.stage('cache_lookup'):
+        keys = [cacheKey(text, modelKey) for text in texts]
+        embeddings = [_embeddingCache.get(key) for key in keys]
     
-    #Match alphanumeric with +, #, . for tech terms (C++, C#, Node.js)
-    tokens = re.findall(r'\b[a-z0-9+#.]+\b', textLower)
+    #Encode each distinct missing text once
+    pending = {}
+    for i, key in enumerate(keys):
+        if embeddings[i] is None:
+            pending.setdefault(key, texts[i])
     
-    #Filter short tokens, stopwords, and pure numbers
-    keywords = {
-        token for token in tokens
-        if (len(token) >= minKeywordLen and 
-            token not in stopwords and
-            not token.isdigit())
-    }
-    return keywords
+    if pending:
+        with metrics.stage('model_encode'):
+            encoded = _encodeUncached(list(pending.values()), batchSize)
+        fresh = dict(zip(pending.keys(), encoded))
+        for key, embedding in fresh.items():
+            _embeddingCache.put(key, embedding)
+        embeddings = [fresh[key] if emb is None else emb for key, emb in zip(keys, embeddings)]
+    
+    return np.asarray(embeddings, dtype=np.float32)
+
+def chunkText(text, chunkWords=chunkWords, overlap=chunkOverlap):
+    """Split text into overlapping windows of chunkWords words. Short texts are returned as-is."""
+    words = text.split()
+    if len(words) <= chunkWords:
+        return [text]
+    
+    step = chunkWords - overlap
+    return [
+        " ".join(words[start:start + chunkWords])
+        for start in range(0, len(words) - overlap, step)
+    ]
+
+def embedDocuments(texts, batchSize=32):
+    """
+    Embed whole documents, returning one row per text.
+    Every chunk of every document goes through a single encodeTexts call
+    (so chunk embeddings are cached), then each document's chunks are pooled.
+    """
+    chunkLists = [chunkText(text) for text in texts]
+    chunkEmbs = encodeTexts([chunk for chunks in chunkLists for chunk in chunks], batchSize=batchSize)
+    
+    docEmbs = []
+    start = 0
+    for chunks in chunkLists:
+        rows = chunkEmbs[start:start + len(chunks)]
+        start += len(chunks)
+        if len(rows) == 1:
+            docEmbs.append(rows[0])
+            continue
+        
+        #Normalize so every chunk counts equally, then pool
+        rows = rows / np.maximum(np.linalg.norm(rows, axis=1, keepdims=True), 1e-12)
+        if chunkPooling == 'max':
+            docEmbs.append(rows.max(axis=0))
+        else:
+            docEmbs.append(rows.mean(axis=0))
+    
+    return np.asarray(docEmbs, dtype=np.float32)
+
+def getCacheStats():
+    """Embedding cache hit/miss counters."""
+    return _embeddingCache.stats()
+
+def _cosineScores(jobEmb, resumeEmbs):
+    """Cosine similarity of one embedding against each row of a matrix."""
+    jobNorm = np.linalg.norm(jobEmb)
+    resumeNorms = np.linalg.norm(resumeEmbs, axis=1)
+    denom = np.maximum(jobNorm * resumeNorms, 1e-12)
+    return (resumeEmbs @ jobEmb) / denom
+
+def extractKeywords(text):
+    """Extract meaningful keywords from text for matching."""
+    with metrics.stage('keyword_extract'):
+        return getTaxonomy().engine.extract(text)
 
 def categorizeKeywords(keywords):
     """Group keywords by type: languages, frameworks, tools, databases, other."""
-    result = {
-        'languages': set(),
-        'frameworks': set(),
-        'tools': set(),
-        'databases': set(),
-        'other': set()
-    }
-    
-    for kw in keywords:
-        categorized = False
-        for catName, catSet in categories.items():
-            if kw in catSet:
-                result[catName].add(kw)
-                categorized = True
-                break
-        
-        if not categorized:
-            result['other'].add(kw)
+    return getTaxonomy().engine.categorize(keywords)
+
+def importantKeywords(keywords):
+    """Keywords in a technical category (anything but 'other'); only these affect the score."""
+    keywordCats = categorizeKeywords(keywords)
+    return frozenset(kw for catName, kws in keywordCats.items() if catName != 'other' for kw in kws)
+
+def _keywordScore(jobKeywords, resumeKeywords, semanticScore, jobImportant=None):
+    """Score technical keyword overlap (0-1). Returns (keywordScore, matched, missing)."""
+    matched = jobKeywords & resumeKeywords
+    missing = jobKeywords - resumeKeywords
+    
+    #Count only technical keywords (not generic 'other' category)
+    if jobImportant is None:
+        jobImportant = importantKeywords(jobKeywords)
+    importantMatched = len(jobImportant & resumeKeywords)
+    importantMissing = len(jobImportant) - importantMatched
+    
+    #Calculate keyword match score (0-1)
+    totalImportant = importantMatched + importantMissing
+    if totalImportant > 0:
+        keywordScore = importantMatched / totalImportant
+    else:
+        #No technical keywords found, rely entirely on semantic score
+        keywordScore = semanticScore
+    
+    return keywordScore, matched, missing
+
+def combineScores(semanticScore, jobKeywords, resumeKeywords, jobImportant=None):
+    """
+    Blend a semantic score with keyword overlap. Returns (finalScore, matched, missing).
+    Pass jobImportant (see importantKeywords) to skip re-categorizing the job's keywords.
+    """
+    with metrics.stage('keyword_score'):
+        keywordScore, matched, missing = _keywordScore(jobKeywords, resumeKeywords, semanticScore, jobImportant)
+    
+    #Weighted combination: 60% semantic, 40% keyword matching by default
+    finalScore = (semanticScore * semanticWeight) + (keywordScore * keywordWeight)
+    
+    return finalScore, matched, missing
+
+class JobProfile:
+    """
+    A job description compiled once for scoring against many resumes:
+    its embedding, keyword set and technical keyword set, plus a stable id.
+    """
+    
+    def __init__(self, jobDesc):
+        self.text = jobDesc
+        self.id = cacheKey(jobDesc, modelKey)[:16]
+        self.embedding = embedDocuments([jobDesc])[0]
+        self._keywords = None
+        self.keywords()
+    
+    def keywords(self):
+        """
+        Returns (keywords, importantKeywords).
+        Re-extracted if the taxonomy was reloaded since the profile was compiled.
+        """
+        taxonomyFingerprint = getTaxonomy().fingerprint
+        cached = self._keywords
+        if cached is None or cached[0] != taxonomyFingerprint:
+            keywords = frozenset(extractKeywords(self.text))
+            cached = (taxonomyFingerprint, keywords, importantKeywords(keywords))
+            self._keywords = cached
+        return cached[1], cached[2]
+
+def compileJobDescription(jobDesc):
+    """Precompute the job side of scoring. Reuse the result with scoreResume or rankResumes."""
+    return JobProfile(jobDesc)
+
+def scoreResume(profile, resumeText):
+    """Score one resume against a compiled JobProfile. Same result as getMatchScore on profile.text."""
+    resumeEmb = embedDocuments([resumeText])
+    semanticScore = float(_cosineScores(profile.embedding, resumeEmb)[0])
     
-    return result
+    jobKeywords, jobImportant = profile.keywords()
+    return combineScores(semanticScore, jobKeywords, extractKeywords(resumeText), jobImportant)
+
+def scoreComponents(profile, resumeTexts, batchSize=32):
+    """
+    The model-dependent and parse-dependent parts of scoring, kept separate so they
+    can be stored and re-blended later (see scoreStore.py).
+    Returns (semanticScores, resumeKeywords): a list of floats and a list of keyword sets.
+    """
+    resumeEmbs = embedDocuments(resumeTexts, batchSize=batchSize)
+    semanticScores = _cosineScores(profile.embedding, resumeEmbs).tolist()
+    return semanticScores, [extractKeywords(text) for text in resumeTexts]
 
 def getMatchScore(jobDesc, resumeText):
     """
@@ -181,42 +265,105 @@ def getMatchScore(jobDesc, resumeText):
     Returns (finalScore, matched, missing).
     
     Scoring strategy:
-    - Semantic similarity: 60% weight (overall content alignment)
-    - Keyword match: 40% weight (specific skills match)
+    - Semantic similarity: 60% weight by default (overall content alignment)
+    - Keyword match: 40% weight by default (specific skills match)
+    - Weights come from semanticWeight / keywordWeight (SCORE_SEMANTIC_WEIGHT, SCORE_KEYWORD_WEIGHT)
     - Only categorized keywords (languages, frameworks, tools, databases) count toward score
     - Generic 'other' keywords shown but don't affect score
     """
     
-    m = loadModel()
-    jobEmb = m.encode(jobDesc, convert_to_tensor=True)
-    resumeEmb = m.encode(resumeText, convert_to_tensor=True)
-    semanticScore = util.pytorch_cos_sim(jobEmb, resumeEmb).item()
+    jobEmb, resumeEmb = embedDocuments([jobDesc, resumeText])
+    semanticScore = float(_cosineScores(jobEmb, resumeEmb[np.newaxis])[0])
     
     jobKeywords = extractKeywords(jobDesc)
     resumeKeywords = extractKeywords(resumeText)
     
-    matched = jobKeywords & resumeKeywords
-    missing = jobKeywords - resumeKeywords
+    return combineScores(semanticScore, jobKeywords, resumeKeywords)
+
+def rankResumes(jobDesc, resumeTexts, topK=None, batchSize=32):
+    """
+    Score one job description (text or JobProfile) against many resumes in a single call.
+    Returns a list of (index, finalScore, matched, missing) sorted best first,
+    where index points back into resumeTexts.
     
-    #Categorize to focus on important technical keywords
-    matchedCats = categorizeKeywords(matched)
-    missingCats = categorizeKeywords(missing)
+    The job description is embedded once, resumes are encoded batchSize at a
+    time, and all cosine similarities come from one matrix operation.
+    Per-candidate scores are identical to getMatchScore.
+    """
+    resumeTexts = list(resumeTexts)
+    if not resumeTexts:
+        return []
     
-    #Count only technical keywords (not generic 'other' category)
-    importantMatched = (len(matchedCats['languages']) + len(matchedCats['frameworks']) + 
-                       len(matchedCats['tools']) + len(matchedCats['databases']))
-    importantMissing = (len(missingCats['languages']) + len(missingCats['frameworks']) + 
-                       len(missingCats['tools']) + len(missingCats['databases']))
+    #Job side is computed once and shared by every candidate
+    profile = jobDesc if isinstance(jobDesc, JobProfile) else compileJobDescription(jobDesc)
+    jobKeywords, jobImportant = profile.keywords()
     
-    #Calculate keyword match score (0-1)
-    totalImportant = importantMatched + importantMissing
-    if totalImportant > 0:
-        keywordScore = importantMatched / totalImportant
-    else:
-        #No technical keywords found, rely entirely on semantic score
-        keywordScore = semanticScore
+    semanticScores, resumeKeywords = scoreComponents(profile, resumeTexts, batchSize=batchSize)
     
-    #Weighted combination: 60% semantic, 40% keyword matching
-    finalScore = (semanticScore * 0.6) + (keywordScore * 0.4)
+    ranked = []
+    for i in range(len(resumeTexts)):
+        finalScore, matched, missing = combineScores(
+            semanticScores[i], jobKeywords, resumeKeywords[i], jobImportant
+        )
+        ranked.append((i, finalScore, matched, missing))
     
-    return finalScore, matched, missing
\ No newline at end of file
+    ranked.sort(key=lambda r: r[1], reverse=True)
+    if topK is not None:
+        ranked = ranked[:topK]
+    return ranked
+
+def splitSentences(text, limit=None):
+    """
+    Split text into sentences and bullet points, dropping fragments shorter than
+    sentenceMinWords and windowing ones longer than sentenceMaxWords.
+    With limit, keeps the sentences naming the most technical keywords, in text order.
+    """
+    sentences = []
+    for part in _sentenceBoundary.split(text):
+        part = part.strip(' :,')
+        if len(part.split()) < sentenceMinWords:
+            continue
+        sentences.extend(chunkText(part, sentenceMaxWords, sentenceMaxWords // 4))
+    sentences = list(dict.fromkeys(sentences))
+    
+    if limit is None or len(sentences) <= limit:
+        return sentences
+    engine = getTaxonomy().engine
+    technical = [sum(1 for kw in engine.extract(s) if kw in engine.categoryOf) for s in sentences]
+    keep = sorted(sorted(range(len(sentences)), key=lambda i: -technical[i])[:limit])
+    return [sentences[i] for i in keep]
+
+def explainMatch(jobDesc, resumeText, batchSize=32):
+    """
+    Show which part of the resume answers each job requirement.
+    The job description (text or JobProfile) is split into requirement sentences and the
+    resume into sentences/bullets (capped at maxRequirements / maxEvidence), all of them are
+    encoded in one encodeTexts call and compared in one similarity matrix.
+    
+    Returns a list in job order of dicts with requirement, evidence (best matching resume
+    sentence), score (cosine similarity, 0-1), and matched / missing technical keywords.
+    """
+    jobText = jobDesc.text if isinstance(jobDesc, JobProfile) else jobDesc
+    requirements = splitSentences(jobText, maxRequirements)
+    evidence = splitSentences(resumeText, maxEvidence)
+    if not requirements or not evidence:
+        return []
+    
+    with metrics.stage('explain'):
+        embs = encodeTexts(requirements + evidence, batchSize=batchSize)
+        embs = embs / np.maximum(np.linalg.norm(embs, axis=1, keepdims=True), 1e-12)
+        similarity = embs[:len(requirements)] @ embs[len(requirements):].T
+        best = similarity.argmax(axis=1)
+    
+    resumeKeywords = extractKeywords(resumeText)
+    explanation = []
+    for i, requirement in enumerate(requirements):
+        needed = importantKeywords(extractKeywords(requirement))
+        explanation.append({
+            'requirement': requirement,
+            'evidence': evidence[best[i]],
+            'score': max(float(similarity[i, best[i]]), 0.0),
+            'matched': needed & resumeKeywords,
+            'missing': needed - resumeKeywords
+        })
+    return explanation
\ No newline at end of file
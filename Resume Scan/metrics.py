@@ -0,0 +1,131 @@
+import bisect
+import contextlib
+import os
+import threading
+import time
+
+#Metrics config (override with environment variables)
+enabled = os.environ.get('METRICS_ENABLED', '0') == '1'
+serverTiming = os.environ.get('SERVER_TIMING', '0') == '1'
+
+#Histogram buckets in seconds
+buckets = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_lock = threading.Lock()
+_stageCounts = {}  #stage -> per-bucket counts (last slot is +Inf)
+_stageSums = {}
+_counters = {}     #(name, labels) -> value
+_gauges = []       #(name, help, fn) evaluated at scrape time
+_local = threading.local()
+
+#Shared no-op returned by stage() when nothing is listening
+_noop = contextlib.nullcontext()
+
+class _StageTimer:
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter() - self.start)
+        return False
+
+def stage(name):
+    """Context manager timing one pipeline stage. Free when metrics and Server-Timing are off."""
+    if not (enabled or serverTiming):
+        return _noop
+    return _StageTimer(name)
+
+def record(name, seconds):
+    """Record a stage duration in the histogram and the current request's timings."""
+    if enabled:
+        with _lock:
+            counts = _stageCounts.get(name)
+            if counts is None:
+                counts = _stageCounts[name] = [0] * (len(buckets) + 1)
+                _stageSums[name] = 0.0
+            counts[bisect.bisect_left(buckets, seconds)] += 1
+            _stageSums[name] += seconds
+
+    timings = getattr(_local, 'timings', None)
+    if timings is not None:
+        timings.append((name, seconds))
+
+def increment(name, amount=1, **labels):
+    """Add to a counter."""
+    if not enabled:
+        return
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+def registerGauge(name, help, fn):
+    """Expose fn() (a number, or None to skip) as a gauge on every scrape."""
+    _gauges.append((name, help, fn))
+
+def startRequestTimings():
+    """Begin collecting stage timings for the request on this thread."""
+    if serverTiming:
+        _local.timings = []
+
+def popRequestTimings():
+    """Stop collecting and return this request's [(stage, seconds)], or None."""
+    timings = getattr(_local, 'timings', None)
+    _local.timings = None
+    return timings
+
+def serverTimingHeader(timings):
+    """Format stage timings as a Server-Timing header value (durations in ms)."""
+    return ", ".join(f"{name};dur={seconds * 1000:.1f}" for name, seconds in timings)
+
+def _formatLabels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{value}"' for key, value in labels) + '}'
+
+def renderPrometheus():
+    """All metrics in the Prometheus text exposition format."""
+    lines = []
+
+    with _lock:
+        stageCounts = {name: list(counts) for name, counts in _stageCounts.items()}
+        stageSums = dict(_stageSums)
+        counters = dict(_counters)
+
+    lines.append("# HELP resume_scan_stage_seconds Time spent in each pipeline stage")
+    lines.append("# TYPE resume_scan_stage_seconds histogram")
+    for name in sorted(stageCounts):
+        counts = stageCounts[name]
+        cumulative = 0
+        for bound, count in zip(buckets, counts):
+            cumulative += count
+            lines.append(f'resume_scan_stage_seconds_bucket{{stage="{name}",le="{bound}"}} {cumulative}')
+        cumulative += counts[-1]
+        lines.append(f'resume_scan_stage_seconds_bucket{{stage="{name}",le="+Inf"}} {cumulative}')
+        lines.append(f'resume_scan_stage_seconds_sum{{stage="{name}"}} {stageSums[name]}')
+        lines.append(f'resume_scan_stage_seconds_count{{stage="{name}"}} {cumulative}')
+
+    typed = set()
+    for (name, labels), value in sorted(counters.items()):
+        if name not in typed:
+            lines.append(f"# TYPE {name} counter")
+            typed.add(name)
+        lines.append(f"{name}{_formatLabels(labels)} {value}")
+
+    for name, help, fn in _gauges:
+        try:
+            value = fn()
+        except Exception:
+            value = None
+        if value is None:
+            continue
+        lines.append(f"# HELP {name} {help}")
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {value}")
+
+    return "\n".join(lines) + "\n"
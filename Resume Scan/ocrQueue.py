@@ -0,0 +1,136 @@
+import os
+import threading
+import time
+import metrics
+import resumeParser
+from resumeParser import pdfKey, cacheText, ocrTextFromPdf, ocrAvailable
+from taskQueue import QueueFullError
+from sharedState import sharedNamespace
+from processPool import ProcessPool
+
+#OCR queue config (override with environment variables)
+ocrEnabled = os.environ.get('OCR_ENABLED', '1') == '1'
+ocrWorkers = int(os.environ.get('OCR_WORKERS', 1))
+maxPending = int(os.environ.get('OCR_QUEUE_SIZE', 16))
+resultTtl = int(os.environ.get('OCR_RESULT_TTL', 3600))  #Seconds finished jobs stay pollable
+ocrTimeout = int(os.environ.get('OCR_TIMEOUT', 600))  #Seconds before another process's pending job is presumed lost
+
+class OcrQueue:
+    """
+    OCR fallback for image-only PDFs, run in its own process pool.
+
+    Jobs are keyed by the PDF's parsed-text cache key, so the same file is
+    only OCR'd once however many times it is submitted. Finished text is
+    written to the parsed-text cache; the next extract call for that file
+    returns it without OCR or PyMuPDF parsing.
+
+    Job status moves pending -> done | failed. With a SharedState, job status
+    is published so other server processes can answer polls and skip
+    re-queueing a file that is already being OCR'd.
+    """
+
+    def __init__(self, workers=ocrWorkers, maxPending=maxPending, resultTtl=resultTtl, shared=None):
+        self.workers = workers
+        self.maxPending = maxPending
+        self.resultTtl = resultTtl
+        self.shared = shared
+        self._pool = ProcessPool(workers)
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, data):
+        """
+        Queue OCR for PDF bytes unless a job for the same file exists.
+        Returns (ocrId, job snapshot); raises QueueFullError when too many jobs are pending.
+        """
+        self._prune()
+        key = pdfKey(data)
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is None and self.shared is not None:
+                job = self.shared.get(key)
+                if job is not None and job['status'] == 'pending' and job['submitted'] < time.time() - ocrTimeout:
+                    job = None
+            #A finished job that found text is only resubmitted if the cache has since lost it
+            if job is not None and (job['status'] == 'pending' or (job['status'] == 'done' and not job['hasText'])):
+                return key, dict(job)
+
+            pending = sum(1 for job in self._jobs.values() if job['status'] == 'pending')
+            if pending >= self.maxPending:
+                raise QueueFullError(f"OCR queue is full ({pending} pending jobs)")
+
+            #A worker that died (e.g. Tesseract crashed) only fails its own job, the pool restarts
+            future = self._pool.submit(ocrTextFromPdf, data, resumeParser.maxPages, resumeParser.maxChars)
+
+            job = {'status': 'pending', 'error': None, 'hasText': None,
+                   'submitted': time.time(), 'finished': None}
+            self._jobs[key] = job
+            snapshot = dict(job)
+        self._publish(key, snapshot)
+        #Snapshot first: a quick job can finish before the callback is attached
+        future.add_done_callback(lambda f: self._finish(key, f))
+        metrics.increment('resume_scan_ocr_jobs_total')
+        return key, snapshot
+
+    def _finish(self, key, future):
+        try:
+            text = future.result()
+        except Exception as e:
+            status, error, hasText = 'failed', str(e), None
+        else:
+            cacheText(key, text)
+            status, error, hasText = 'done', None, bool(text.strip())
+
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is None:
+                return
+            job.update(status=status, error=error, hasText=hasText, finished=time.time())
+            snapshot = dict(job)
+        self._publish(key, snapshot)
+
+    def _publish(self, key, job):
+        if self.shared is None:
+            return
+        try:
+            self.shared.put(key, job)
+        except OSError:
+            pass  #Other processes just won't see this update
+
+    def get(self, ocrId):
+        """Snapshot of a job's state, or None if unknown or expired."""
+        self._prune()
+        with self._lock:
+            job = self._jobs.get(ocrId)
+            if job is not None:
+                return dict(job)
+        #Owned by another server process
+        return self.shared.get(ocrId) if self.shared is not None else None
+
+    def pending(self):
+        """Number of jobs waiting for or running OCR."""
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if job['status'] == 'pending')
+
+    def _prune(self):
+        """Forget finished jobs older than resultTtl (their text stays in the cache)."""
+        cutoff = time.time() - self.resultTtl
+        with self._lock:
+            expired = [key for key, job in self._jobs.items()
+                       if job['finished'] is not None and job['finished'] < cutoff]
+            for key in expired:
+                del self._jobs[key]
+
+#Shared queue, created on first use
+_ocrQueue = None
+_ocrQueueLock = threading.Lock()
+
+def getOcrQueue():
+    """The shared OCR queue, or None when OCR is disabled or Tesseract isn't installed."""
+    global _ocrQueue
+    if not ocrEnabled or not ocrAvailable():
+        return None
+    with _ocrQueueLock:
+        if _ocrQueue is None:
+            _ocrQueue = OcrQueue(shared=sharedNamespace('ocr', resultTtl))
+        return _ocrQueue
@@ -0,0 +1,36 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+class ProcessPool:
+    """
+    Process pool started on first submit and replaced if a worker dies.
+
+    A worker killed mid-task (OOM killer, a crash in native PDF or OCR code)
+    leaves a ProcessPoolExecutor permanently broken, so the next submit starts
+    a fresh one. Futures of the task that was running still raise
+    BrokenProcessPool; callers decide whether to retry or fall back.
+    """
+
+    def __init__(self, workers):
+        self.workers = workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _start(self):
+        #Spawn instead of fork so workers never inherit server threads or locks
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn')
+        )
+        return self._executor
+
+    def submit(self, fn, *args):
+        with self._lock:
+            executor = self._executor or self._start()
+            try:
+                return executor.submit(fn, *args)
+            except BrokenProcessPool:
+                executor.shutdown(wait=False)
+                return self._start().submit(fn, *args)
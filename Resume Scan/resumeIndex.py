@@ -0,0 +1,214 @@
+import contextlib
+import json
+import os
+import threading
+import numpy as np
+from appendLog import AppendLog
+from matcher import embedDocuments, extractKeywords, combineScores, modelKey
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  #Windows: no cross-process locking, ingest from a single process
+
+#Index config (override with environment variables)
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+indexDir = os.environ.get('RESUME_INDEX_DIR', os.path.join(_BASE_DIR, 'data', 'resume_index'))
+shortlistFactor = 5    #Candidates re-ranked per requested result
+minShortlist = 50
+
+class ResumeIndex:
+    """
+    Append-only store of resume embeddings for fast top-K queries.
+
+    Files in the index directory:
+    - embeddings.f32: float32 matrix, one L2-normalized row per resume (memory-mapped for queries)
+    - meta.jsonl: one JSON line per row with id, name and keyword list
+    - index.json: model key (name + backend), embedding dimension and committed row count
+    - index.lock: lock file, so several server processes can share one index
+
+    Every process keeps its own view (row count, ids, metadata offsets) and
+    catches up on rows other processes committed before each query or append.
+    Appends hold an exclusive lock and commit by rewriting index.json last.
+    """
+
+    def __init__(self, directory=indexDir):
+        self.directory = directory
+        self._matrixPath = os.path.join(directory, 'embeddings.f32')
+        self._metaPath = os.path.join(directory, 'meta.jsonl')
+        self._headerPath = os.path.join(directory, 'index.json')
+        self._lockPath = os.path.join(directory, 'index.lock')
+        self._lock = threading.Lock()
+        self._matrix = None
+        self._log = AppendLog(self._matrixPath, self._metaPath)
+        self._ids = {}
+        self.dim = None
+        self.count = 0
+        with self._fileLock(exclusive=False):
+            self._refresh()
+
+    @contextlib.contextmanager
+    def _fileLock(self, exclusive):
+        """Cross-process lock on the index: shared for reading, exclusive for appending."""
+        if fcntl is None or not (exclusive or os.path.isdir(self.directory)):
+            yield
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._lockPath, 'a') as f:
+            fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _refresh(self):
+        """Pick up rows committed since the last call, by this or another process. Needs the file lock."""
+        if not os.path.exists(self._headerPath):
+            return
+
+        with open(self._headerPath) as f:
+            header = json.load(f)
+        if header['modelName'] != modelKey:
+            raise ValueError(
+                f"Index at {self.directory} was built with {header['modelName']}, "
+                f"current model is {modelKey}"
+            )
+        self.dim = header['dim']
+        self._log.rowBytes = self.dim * 4
+
+        #Rows past the header's count were never committed; the next append trims them
+        metas = self._log.refresh(limit=header['count'])
+        for row, meta in enumerate(metas, self.count):
+            self._ids[meta['id']] = row
+        if metas:
+            self.count = self._log.count
+            self._matrix = None  #Remap on next query
+
+    def _writeHeader(self):
+        tempPath = self._headerPath + '.tmp'
+        with open(tempPath, 'w') as f:
+            json.dump({'modelName': modelKey, 'dim': self.dim, 'count': self.count}, f)
+        os.replace(tempPath, self._headerPath)
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, resumeId):
+        return resumeId in self._ids
+
+    def add(self, resumeId, text, name=None):
+        """Ingest one resume. Returns False if resumeId is already indexed."""
+        return self.addMany([(resumeId, text, name)]) == 1
+
+    def addMany(self, items, batchSize=32):
+        """
+        Ingest (resumeId, text, name) tuples, embedding them in batches.
+        Already-indexed ids are skipped. Returns the number of rows added.
+        """
+        with self._lock:
+            with self._fileLock(exclusive=False):
+                self._refresh()
+            seen = set()
+            fresh = []
+            for resumeId, text, name in items:
+                if resumeId in self._ids or resumeId in seen:
+                    continue
+                seen.add(resumeId)
+                fresh.append((resumeId, text, name))
+            if not fresh:
+                return 0
+
+            #Embed without holding the file lock, other processes keep querying meanwhile
+            embeddings = embedDocuments([text for _, text, _ in fresh], batchSize=batchSize)
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings = (embeddings / np.maximum(norms, 1e-12)).astype(np.float32)
+
+            with self._fileLock(exclusive=True):
+                #Another process may have added some of these in the meantime
+                self._refresh()
+                keep = [i for i, (resumeId, _, _) in enumerate(fresh) if resumeId not in self._ids]
+                if not keep:
+                    return 0
+                fresh = [fresh[i] for i in keep]
+                embeddings = embeddings[keep]
+                return self._append(fresh, embeddings)
+
+    def _append(self, fresh, embeddings):
+        """Write new rows and commit them. Needs the exclusive file lock."""
+        if self.dim is None:
+            self.dim = embeddings.shape[1]
+            self._log.rowBytes = self.dim * 4
+
+        #Matrix rows and metadata first, header (the committed count) last
+        self._log.truncate()
+        self._log.append(embeddings.tobytes(), [
+            {'id': resumeId, 'name': name, 'keywords': sorted(extractKeywords(text))}
+            for resumeId, text, name in fresh
+        ])
+        for row, (resumeId, _, _) in enumerate(fresh, self.count):
+            self._ids[resumeId] = row
+
+        self.count = self._log.count
+        self._writeHeader()
+        self._matrix = None  #Remap on next query
+        return len(fresh)
+
+    def query(self, jobDesc, topK=10):
+        """
+        Return the best topK resumes for a job description, best first.
+
+        Semantic similarity is computed against every stored row with one
+        matrix-vector product; the keyword score is applied only to the shortlist.
+        """
+        with self._lock:
+            with self._fileLock(exclusive=False):
+                self._refresh()
+            if self.count == 0:
+                return []
+            if self._matrix is None:
+                self._matrix = np.memmap(self._matrixPath, dtype=np.float32, mode='r',
+                                         shape=(self.count, self.dim))
+            matrix = self._matrix
+
+        jobEmb = embedDocuments([jobDesc])[0]
+        jobEmb = jobEmb / max(np.linalg.norm(jobEmb), 1e-12)
+        similarities = matrix @ jobEmb
+
+        #Shortlist by semantic similarity only
+        shortlistSize = min(len(similarities), max(topK * shortlistFactor, minShortlist))
+        if shortlistSize < len(similarities):
+            shortlist = np.argpartition(-similarities, shortlistSize - 1)[:shortlistSize]
+        else:
+            shortlist = np.arange(len(similarities))
+
+        #Re-rank the shortlist with the full score
+        jobKeywords = extractKeywords(jobDesc)
+        metas = self._log.readRecords(shortlist.tolist())
+        results = []
+        for row in shortlist.tolist():
+            meta = metas[row]
+            semanticScore = float(similarities[row])
+            finalScore, matched, missing = combineScores(semanticScore, jobKeywords, set(meta['keywords']))
+            results.append({
+                'id': meta['id'],
+                'name': meta['name'],
+                'score': finalScore,
+                'semanticScore': semanticScore,
+                'matched': matched,
+                'missing': missing
+            })
+
+        results.sort(key=lambda r: r['score'], reverse=True)
+        return results[:topK]
+
+#Shared index instance, opened on first use
+_index = None
+_indexLock = threading.Lock()
+
+def getIndex():
+    """Open the default index on first use. Cached after first load."""
+    global _index
+    with _indexLock:
+        if _index is None:
+            _index = ResumeIndex()
+        return _index
@@ -1,22 +1,166 @@
 import fitz
+import os
+import sys
+import tempfile
+from concurrent.futures.process import BrokenProcessPool
+import metrics
+from processPool import ProcessPool
+from textCache import TextCache, textKey
 
-def extractTextFromPdf(filePath):
-    """Extract text from PDF. Returns normalized text."""
-    
-    doc = fitz.open(filePath)
+#Extraction limits (override with environment variables)
+maxPages = int(os.environ.get('PDF_MAX_PAGES', 50))
+maxChars = int(os.environ.get('PDF_MAX_CHARS', 200000))
+
+#Documents with more pages than this are split across a process pool
+parallelPageThreshold = int(os.environ.get('PDF_PARALLEL_PAGES', 24))
+parallelWorkers = int(os.environ.get('PDF_PARSE_WORKERS', min(4, os.cpu_count() or 1)))
+
+#OCR settings for image-only PDFs (needs Tesseract installed)
+ocrLanguage = os.environ.get('OCR_LANGUAGE', 'eng')
+ocrDpi = int(os.environ.get('OCR_DPI', 300))
+
+#Extracted text keyed by file content, so repeat uploads skip PyMuPDF
+_textCache = TextCache()
+
+#Worker pool for large documents, started on first use
+_pool = ProcessPool(parallelWorkers)
+
+def _openDoc(source):
+    """Open a PDF from a file path or from bytes."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return fitz.open(stream=source, filetype='pdf')
+    return fitz.open(source)
+
+def _pageText(page, ocr=False):
+    if ocr:
+        textPage = page.get_textpage_ocr(language=ocrLanguage, dpi=ocrDpi, full=True)
+        return page.get_text(textpage=textPage)
+    return page.get_text()
+
+def _normalizedPages(doc, start, end, charBudget, ocr=False):
+    """Yield whitespace-normalized page text for pages [start, end) until charBudget is spent."""
+    for pageNum in range(start, end):
+        if charBudget <= 0:
+            break
+        pageText = " ".join(_pageText(doc[pageNum], ocr).split())
+        if pageText:
+            pageText = pageText[:charBudget]
+            charBudget -= len(pageText) + 1
+            yield pageText
+
+def _extractPageRange(source, start, end, charBudget):
+    """Process pool entry point: normalized text of one page range."""
+    doc = _openDoc(source)
+    try:
+        return list(_normalizedPages(doc, start, end, charBudget))
+    finally:
+        doc.close()
+
+def _extract(source, label, maxPages, maxChars):
+    doc = _openDoc(source)
     
-    if doc.is_encrypted:
+    try:
+        if doc.is_encrypted:
+            raise RuntimeError(f"PDF is password-protected: {label}")
+        
+        pageCount = doc.page_count if maxPages is None else min(doc.page_count, maxPages)
+        charBudget = maxChars if maxChars is not None else sys.maxsize
+        
+        if pageCount <= parallelPageThreshold or parallelWorkers < 2:
+            return " ".join(_normalizedPages(doc, 0, pageCount, charBudget))
+    finally:
         doc.close()
-        raise RuntimeError(f"PDF is password-protected: {filePath}")
+    
+    #Workers open one temporary copy of an upload by path instead of each receiving the bytes pickled
+    tempPath = None
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        with tempfile.NamedTemporaryFile(prefix='resume-', suffix='.pdf', delete=False) as f:
+            f.write(source)
+        source = tempPath = f.name
+    
+    try:
+        return _extractParallel(source, pageCount, charBudget)
+    except BrokenProcessPool:
+        #A worker died (e.g. OOM-killed); the pool restarts on its next submit, parse this one here
+        return " ".join(_extractPageRange(source, 0, pageCount, charBudget))
+    finally:
+        if tempPath is not None:
+            os.remove(tempPath)
+
+def _extractParallel(source, pageCount, charBudget):
+    #Large document: one contiguous page range per worker, reassembled in order
+    chunkSize = -(-pageCount // parallelWorkers)
+    futures = [
+        _pool.submit(_extractPageRange, source, start, min(start + chunkSize, pageCount), charBudget)
+        for start in range(0, pageCount, chunkSize)
+    ]
     
     textParts = []
-    for page in doc:
-        pageText = page.get_text()
-        if pageText:
+    for future in futures:
+        for pageText in future.result():
+            if charBudget <= 0:
+                break
+            pageText = pageText[:charBudget]
+            charBudget -= len(pageText) + 1
             textParts.append(pageText)
     
-    doc.close()
-    
-    fullText = "\n".join(textParts)
-    normalized = " ".join(fullText.split())
-    return normalized
\ No newline at end of file
+    return " ".join(textParts)
+
+def _cachedExtract(source, data, label, maxPages, maxChars):
+    key = pdfKey(data, maxPages, maxChars)
+    text = _textCache.get(key)
+    if not text:
+        with metrics.stage('pdf_parse'):
+            text = _extract(source, label, maxPages, maxChars)
+        #No text (image-only PDF) is not cached: a stale "" would shadow the OCR result
+        if text.strip():
+            _textCache.put(key, text)
+    return text
+
+def extractTextFromPdf(filePath, maxPages=maxPages, maxChars=maxChars):
+    """Extract text from PDF. Returns normalized text, cached by file content."""
+    with open(filePath, 'rb') as f:
+        data = f.read()
+    return _cachedExtract(filePath, data, filePath, maxPages, maxChars)
+
+def extractTextFromBytes(data, maxPages=maxPages, maxChars=maxChars, name='upload'):
+    """Extract text from PDF bytes (e.g. an upload) without touching disk. Returns normalized text, cached by content."""
+    return _cachedExtract(data, data, name, maxPages, maxChars)
+
+def getTextCacheStats():
+    """Parsed-text cache hit/miss counters and sizes."""
+    return _textCache.stats()
+
+_ocrAvailable = None
+
+def ocrAvailable():
+    """True if PyMuPDF can find Tesseract's language data. Checked once."""
+    global _ocrAvailable
+    if _ocrAvailable is None:
+        try:
+            _ocrAvailable = bool(fitz.get_tessdata())
+        except Exception:
+            _ocrAvailable = False
+    return _ocrAvailable
+
+def ocrTextFromPdf(source, maxPages=maxPages, maxChars=maxChars):
+    """
+    OCR an image-only PDF (file path or bytes). Returns normalized text.
+    Takes seconds per page, so callers run it in a worker process, never on a request thread.
+    """
+    doc = _openDoc(source)
+    try:
+        pageCount = doc.page_count if maxPages is None else min(doc.page_count, maxPages)
+        charBudget = maxChars if maxChars is not None else sys.maxsize
+        return " ".join(_normalizedPages(doc, 0, pageCount, charBudget, ocr=True))
+    finally:
+        doc.close()
+
+def pdfKey(data, maxPages=maxPages, maxChars=maxChars):
+    """Parsed-text cache key for PDF bytes."""
+    return textKey(data, maxPages, maxChars)
+
+def cacheText(key, text):
+    """Store text (e.g. OCR output) under a pdfKey, so later extract calls return it directly. Empty text is skipped."""
+    if text.strip():
+        _textCache.put(key, text)
\ No newline at end of file
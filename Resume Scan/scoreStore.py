@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""Re-rank stored score components after a weight or taxonomy change, without parsing PDFs or calling the model."""
+
+import argparse
+import json
+import os
+import sys
+import time
+import zipfile
+import numpy as np
+import matcher
+from appendLog import AppendLog
+from matcher import modelKey, extractKeywords, categorizeKeywords
+from taxonomy import getTaxonomy
+
+#Bumped when the stored row layout changes; older stores must be rebuilt
+storeFormat = 2
+
+class ScoreStore:
+    """
+    Score components for one job description against many resumes.
+
+    Only the expensive parts of a score are stored: the semantic similarity
+    (model) and each resume's raw token sequence (PDF parse). Keywords, their
+    categories and the score blend are recomputed from these on demand with
+    the current taxonomy, so a new weighting, skill, alias or multi-word term
+    never needs the original PDFs.
+
+    Files in the store directory:
+    - job.json: job description text, model key and store format
+    - semantic.f32: float32 semantic similarity, one value per row
+    - resumes.jsonl: one JSON line per row with id and space-separated tokens
+    - presence.npz: cache of which job keywords each row contains, for one
+      taxonomy fingerprint (safe to delete)
+    """
+
+    def __init__(self, directory, jobDesc=None):
+        self.directory = directory
+        self._jobPath = os.path.join(directory, 'job.json')
+        self._semanticPath = os.path.join(directory, 'semantic.f32')
+        self._resumesPath = os.path.join(directory, 'resumes.jsonl')
+        self._presencePath = os.path.join(directory, 'presence.npz')
+        self._log = AppendLog(self._semanticPath, self._resumesPath, rowBytes=4)
+        self._ids = {}
+        self._semantic = None
+        self._presence = None  #(taxonomy fingerprint, job keywords, row x job keyword matrix)
+        self.count = 0
+
+        if os.path.exists(self._jobPath):
+            with open(self._jobPath, encoding='utf-8') as f:
+                job = json.load(f)
+            if job.get('format') != storeFormat:
+                raise ValueError(
+                    f"Score store at {directory} uses an older format, score the resumes again into a new store"
+                )
+            if job['modelName'] != modelKey:
+                raise ValueError(
+                    f"Score store at {directory} was built with {job['modelName']}, "
+                    f"current model is {modelKey}"
+                )
+            if jobDesc is not None and jobDesc != job['jobDesc']:
+                raise ValueError(f"Score store at {directory} holds scores for a different job description")
+            self.jobDesc = job['jobDesc']
+            self._load()
+        elif jobDesc is None:
+            raise FileNotFoundError(f"No score store at {directory}")
+        else:
+            os.makedirs(directory, exist_ok=True)
+            self.jobDesc = jobDesc
+            with open(self._jobPath, 'w', encoding='utf-8') as f:
+                json.dump({'format': storeFormat, 'modelName': modelKey, 'jobDesc': jobDesc}, f)
+
+    def _load(self):
+        #A torn append is left in place here and trimmed by the next addMany
+        self._ids = {record['id']: row for row, record in enumerate(self._log.refresh())}
+        self.count = self._log.count
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, resumeId):
+        return resumeId in self._ids
+
+    def addMany(self, resumeIds, resumeTexts, semanticScores):
+        """Append components for new resumes (semantic scores from matcher.scoreComponents). Known ids are skipped."""
+        engine = getTaxonomy().engine
+        rows = []
+        for resumeId, text, semanticScore in zip(resumeIds, resumeTexts, semanticScores):
+            if resumeId in self._ids:
+                continue
+            self._ids[resumeId] = self.count + len(rows)
+            rows.append((resumeId, semanticScore, " ".join(engine.tokens(text))))
+        if not rows:
+            return 0
+
+        self._log.truncate()
+        self._log.append(np.array([row[1] for row in rows], dtype=np.float32).tobytes(), [
+            {'id': resumeId, 'tokens': tokens}
+            for resumeId, _, tokens in rows
+        ])
+
+        self.count = self._log.count
+        self._semantic = None
+        self._presence = None
+        return len(rows)
+
+    def _loadPresence(self, fingerprint):
+        """Persisted (jobKeywords, presence) for rows extracted under this taxonomy, or None."""
+        try:
+            with np.load(self._presencePath, allow_pickle=False) as cached:
+                if str(cached['fingerprint']) != fingerprint:
+                    return None
+                return cached['jobKeywords'].tolist(), cached['presence'][:self.count].astype(np.float32)
+        except (OSError, EOFError, ValueError, KeyError, zipfile.BadZipFile):
+            #Missing or unreadable cache, extract again
+            return None
+
+    def _savePresence(self, fingerprint, jobKeywords, presence):
+        tempPath = f"{self._presencePath}.{os.getpid()}.tmp"
+        try:
+            with open(tempPath, 'wb') as f:
+                np.savez(f, fingerprint=np.array(fingerprint), jobKeywords=np.array(jobKeywords, dtype=str),
+                         presence=presence.astype(np.uint8))
+            os.replace(tempPath, self._presencePath)
+        except OSError:
+            #Only a cache, the next run extracts again
+            pass
+
+    def _extractPresence(self, jobKeywords, start):
+        """Presence rows for stored rows start..count, extracted from their tokens."""
+        columns = {kw: i for i, kw in enumerate(jobKeywords)}
+        engine = getTaxonomy().engine
+        presence = np.zeros((self.count - start, len(jobKeywords)), dtype=np.float32)
+        if not len(presence):
+            return presence
+        with open(self._resumesPath, 'rb') as f:
+            f.seek(self._log.offsets[start])
+            for row, line in zip(range(len(presence)), f):
+                #Same extraction extractKeywords runs on the resume text
+                for kw in engine.extract(json.loads(line)['tokens']):
+                    col = columns.get(kw)
+                    if col is not None:
+                        presence[row, col] = 1.0
+        return presence
+
+    def _components(self):
+        """
+        Returns (semanticScores, jobKeywords, presence) for the current taxonomy, where
+        presence[row, i] says whether resume row contains jobKeywords[i].
+        Presence is kept in presence.npz per taxonomy fingerprint: only rows added
+        since are extracted, everything only when the taxonomy changes.
+        """
+        if self._semantic is None:
+            self._semantic = np.fromfile(self._semanticPath, dtype=np.float32, count=self.count)
+
+        fingerprint = getTaxonomy().fingerprint
+        cached = self._presence
+        if cached is None or cached[0] != fingerprint:
+            jobKeywords, presence = self._loadPresence(fingerprint) or (sorted(extractKeywords(self.jobDesc)), None)
+            if presence is None or len(presence) < self.count:
+                done = 0 if presence is None else len(presence)
+                extra = self._extractPresence(jobKeywords, done)
+                presence = extra if presence is None else np.vstack([presence, extra])
+                if len(extra):
+                    self._savePresence(fingerprint, jobKeywords, presence)
+            cached = (fingerprint, jobKeywords, presence)
+            self._presence = cached
+        return self._semantic, cached[1], cached[2]
+
+    def rescore(self, semanticWeight=None, keywordWeight=None):
+        """
+        Recompute every stored score with the current taxonomy and the given weights
+        (default: matcher.semanticWeight / matcher.keywordWeight). Same values as
+        combineScores would give. Returns (finalScores, keywordScores, categoryCounts)
+        where categoryCounts maps each technical category to (matched per row, total in job).
+        """
+        if semanticWeight is None:
+            semanticWeight = matcher.semanticWeight
+        if keywordWeight is None:
+            keywordWeight = matcher.keywordWeight
+
+        semanticScores, jobKeywords, presence = self._components()
+
+        #Job keyword -> category as a one-hot matrix, 'other' left out
+        jobCats = categorizeKeywords(jobKeywords)
+        catNames = [catName for catName in jobCats if catName != 'other']
+        columns = {kw: i for i, kw in enumerate(jobKeywords)}
+        catMatrix = np.zeros((len(jobKeywords), len(catNames)), dtype=np.float32)
+        for j, catName in enumerate(catNames):
+            for kw in jobCats[catName]:
+                catMatrix[columns[kw], j] = 1.0
+
+        matchedCounts = presence @ catMatrix
+        jobCounts = catMatrix.sum(axis=0)
+        totalImportant = jobCounts.sum()
+        if totalImportant > 0:
+            keywordScores = matchedCounts.sum(axis=1) / totalImportant
+        else:
+            #No technical keywords in the job, rely entirely on semantic score
+            keywordScores = semanticScores
+
+        finalScores = semanticScores * semanticWeight + keywordScores * keywordWeight
+        categoryCounts = {catName: (matchedCounts[:, j], int(jobCounts[j])) for j, catName in enumerate(catNames)}
+        return finalScores, keywordScores, categoryCounts
+
+    def rank(self, topK=None, semanticWeight=None, keywordWeight=None):
+        """
+        Stored resumes re-scored and sorted best first, as dicts with id, score,
+        semanticScore, keywordScore, matched and missing.
+        """
+        if self.count == 0:
+            return []
+        finalScores, keywordScores, _ = self.rescore(semanticWeight, keywordWeight)
+        semanticScores, jobKeywords, presence = self._components()
+
+        order = np.argsort(-finalScores, kind='stable')
+        if topK is not None:
+            order = order[:topK]
+
+        ids = [None] * self.count
+        for resumeId, row in self._ids.items():
+            ids[row] = resumeId
+
+        results = []
+        for row in order.tolist():
+            hits = presence[row]
+            results.append({
+                'id': ids[row],
+                'score': float(finalScores[row]),
+                'semanticScore': float(semanticScores[row]),
+                'keywordScore': float(keywordScores[row]),
+                'matched': [kw for kw, hit in zip(jobKeywords, hits) if hit],
+                'missing': [kw for kw, hit in zip(jobKeywords, hits) if not hit]
+            })
+        return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--store', required=True, help="Score store directory written by main.py --store")
+    parser.add_argument('--out', required=True, help="Output file, .jsonl or .csv (overwritten)")
+    parser.add_argument('--semantic-weight', type=float, default=None,
+                        help=f"Weight of semantic similarity (default: {matcher.semanticWeight})")
+    parser.add_argument('--keyword-weight', type=float, default=None,
+                        help="Weight of keyword match (default: 1 - semantic weight)")
+    parser.add_argument('--top', type=int, default=None, help="Only write the best N resumes")
+    args = parser.parse_args(argv)
+
+    semanticWeight = args.semantic_weight if args.semantic_weight is not None else matcher.semanticWeight
+    keywordWeight = args.keyword_weight if args.keyword_weight is not None else (
+        1 - semanticWeight if args.semantic_weight is not None else matcher.keywordWeight
+    )
+    if semanticWeight < 0 or keywordWeight < 0:
+        parser.error("weights must not be negative")
+
+    try:
+        store = ScoreStore(args.store)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"STORE_ERROR: {e}")
+        sys.exit(1)
+
+    from main import ResultWriter
+
+    startTime = time.time()
+    ranked = store.rank(topK=args.top, semanticWeight=semanticWeight, keywordWeight=keywordWeight)
+
+    if os.path.exists(args.out):
+        os.remove(args.out)
+    writer = ResultWriter(args.out)
+    try:
+        for result in ranked:
+            writer.write({
+                'file': result['id'],
+                'score': round(result['score'] * 100, 1),
+                'matched': result['matched'],
+                'missing': result['missing'],
+                'error': None
+            })
+    finally:
+        writer.close()
+
+    print(f"Re-scored {len(store)} resumes in {time.time() - startTime:.2f}s "
+          f"(semantic {semanticWeight:g}, keyword {keywordWeight:g}). Results in {args.out}", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,20 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, jsonify, g
 import os
-import tempfile
-from resumeParser import extractTextFromPdf
-from matcher import getMatchScore, categorizeKeywords
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+import metrics
+import matcher
+from resumeParser import extractTextFromBytes, getTextCacheStats
+from matcher import (getMatchScore, rankResumes, categorizeKeywords, enableMicroBatching, isModelLoaded, warmUpModel,
+                     compileJobDescription, scoreResume, JobProfile, explainMatch)
+from resumeIndex import getIndex
+from taskQueue import TaskQueue, QueueFullError, resultTtl as taskResultTtl
+from ocrQueue import getOcrQueue
+from sharedState import sharedNamespace
+from taxonomy import getTaxonomy
+import inferenceBackend
 
 # Ensure Flask can find templates/static that live one level up
 _BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -14,81 +26,532 @@ app = Flask(
 )
 app.config['MAX_CONTENT_LENGTH'] = 50 * 1024 * 1024  #50MB max
 
+#Spawned PDF/OCR pool workers re-import this file as __mp_main__ when it's run as a script; they never serve requests
+_poolWorker = __name__ == '__mp_main__'
+
+#Coalesce concurrent requests into batched model calls (ENCODE_MICRO_BATCHING=0 to disable)
+_scheduler = None
+if not _poolWorker and os.environ.get('ENCODE_MICRO_BATCHING', '1') != '0':
+    _scheduler = enableMicroBatching()
+
+#Model warm-up state, reported by /readyz ('cold' = no warm-up started, the model loads on first use)
+_warmupEnabled = os.environ.get('MODEL_WARMUP', '0') == '1'
+_warmupState = {'status': 'cold', 'error': None}
+
+def _runWarmup():
+    try:
+        warmUpModel()
+        _warmupState['status'] = 'ready'
+    except Exception as e:
+        _warmupState['status'] = 'failed'
+        _warmupState['error'] = str(e)
+
+def startWarmup():
+    """Load the model in a background thread so startup isn't blocked. /readyz returns 503 until it's done."""
+    _warmupState['status'] = 'warming'
+    _warmupState['error'] = None
+    thread = threading.Thread(target=_runWarmup, name='model-warmup', daemon=True)
+    thread.start()
+    return thread
+
+#Opt-in with MODEL_WARMUP=1. Run as a script, the warm-up starts below instead, in the process that serves
+if _warmupEnabled and __name__ not in ('__main__', '__mp_main__'):
+    startWarmup()
+
+def preload():
+    """
+    Load the model, taxonomy and resume index before worker processes are forked
+    (see gunicorn.conf.py), so every worker shares one copy-on-write copy.
+    Loads only: no inference runs, so no torch thread pool exists at fork time.
+    """
+    #ONNX Runtime sessions own thread pools that don't survive fork, so those workers warm up their own
+    if inferenceBackend.backend == 'torch':
+        matcher.loadModel()
+        _warmupState['status'] = 'ready'
+    getTaxonomy()
+    try:
+        getIndex()
+    except ValueError as e:
+        #Index built with another model, /api/index/* will report it
+        print(f"INDEX_NOT_PRELOADED: {e}")
+
+#Scrape-time gauges for /metrics
+metrics.registerGauge('resume_scan_model_loaded', 'Whether the embedding model is loaded',
+                      lambda: int(isModelLoaded()))
+metrics.registerGauge('resume_scan_model_load_seconds', 'Time taken to load the embedding model',
+                      lambda: matcher.modelLoadSeconds)
+metrics.registerGauge('resume_scan_embedding_cache_hit_ratio', 'Embedding cache hits / lookups',
+                      lambda: matcher.getCacheStats()['hitRatio'])
+metrics.registerGauge('resume_scan_embedding_cache_misses', 'Embedding cache misses since startup',
+                      lambda: matcher.getCacheStats()['misses'])
+metrics.registerGauge('resume_scan_queue_depth', 'Async analysis tasks waiting for a worker',
+                      lambda: _taskQueue.depth() if _taskQueue else 0)
+metrics.registerGauge('resume_scan_queue_running', 'Async analysis tasks being processed',
+                      lambda: _taskQueue.running() if _taskQueue else 0)
+metrics.registerGauge('resume_scan_text_cache_hit_ratio', 'Parsed-text cache hits / lookups',
+                      lambda: getTextCacheStats()['hitRatio'])
+metrics.registerGauge('resume_scan_ocr_pending', 'OCR jobs waiting for or running in the OCR pool',
+                      lambda: getOcrQueue().pending() if getOcrQueue() else None)
+metrics.registerGauge('resume_scan_encode_mean_batch_size', 'Mean texts per micro-batched encode call',
+                      lambda: _scheduler.stats()['meanBatchSize'] if _scheduler else None)
+
+@app.before_request
+def _startTimings():
+    g.requestStart = time.perf_counter()
+    metrics.startRequestTimings()
+
+@app.after_request
+def _finishTimings(response):
+    timings = metrics.popRequestTimings()
+    start = g.get('requestStart')
+    if start is not None:
+        elapsed = time.perf_counter() - start
+        metrics.record('request', elapsed)
+        if timings is not None:
+            timings.append(('total', elapsed))
+    metrics.increment('resume_scan_requests_total', endpoint=request.endpoint or 'unknown',
+                      status=response.status_code)
+    if timings:
+        response.headers['Server-Timing'] = metrics.serverTimingHeader(timings)
+    return response
+
+@app.route('/metrics')
+def metricsEndpoint():
+    return metrics.renderPrometheus(), 200, {'Content-Type': 'text/plain; version=0.0.4'}
+
 @app.route('/')
 def index():
     return render_template('index.html')
 
+@app.route('/healthz')
+def healthz():
+    #Process is up and serving requests
+    return jsonify({'status': 'ok'})
+
+@app.route('/readyz')
+def readyz():
+    #Without a warm-up the model loads lazily, so there is nothing to wait for
+    if _warmupState['status'] == 'cold' or isModelLoaded():
+        return jsonify({'status': 'ready', 'modelLoaded': isModelLoaded()})
+    
+    body = {'status': _warmupState['status'], 'modelLoaded': False}
+    if _warmupState['error']:
+        body['error'] = _warmupState['error']
+    return jsonify(body), 503
+
+def _buildResult(score, matched, missing):
+    """Build the JSON result for one scored resume."""
+    #Categorize keywords
+    matchedCats = categorizeKeywords(matched)
+    missingCats = categorizeKeywords(missing)
+    
+    return {
+        'score': round(score * 100, 1),
+        'matched': sorted(list(matched)),
+        'missing': sorted(list(missing)),
+        'matchedCategories': {catName: sorted(list(kws)) for catName, kws in matchedCats.items()},
+        'missingCategories': {catName: sorted(list(kws)) for catName, kws in missingCats.items()}
+    }
+
+def _buildExplanation(explanation):
+    """JSON form of matcher.explainMatch output, scores as percentages."""
+    return [{
+        'requirement': item['requirement'],
+        'evidence': item['evidence'],
+        'score': round(item['score'] * 100, 1),
+        'matched': sorted(item['matched']),
+        'missing': sorted(item['missing'])
+    } for item in explanation]
+
+def _extractPdfBytes(pdfBytes, name='upload'):
+    """Extract text from PDF bytes in memory."""
+    return extractTextFromBytes(pdfBytes, name=name)
+
+def _readUpload(resumeFile):
+    """Read an uploaded file into memory."""
+    with metrics.stage('upload_read'):
+        return resumeFile.read()
+
+#Compiled job descriptions registered through /api/jobs, least recently used evicted first
+_jobProfileLimit = int(os.environ.get('JOB_PROFILE_CACHE_SIZE', 256))
+_jobProfiles = OrderedDict()
+_jobProfilesLock = threading.Lock()
+
+#Job description text by id, so any server process can rebuild a profile another one registered
+_sharedJobs = sharedNamespace('jobs', int(os.environ.get('JOB_PROFILE_TTL', 86400)))
+
+def _rememberJob(profile):
+    with _jobProfilesLock:
+        _jobProfiles[profile.id] = profile
+        _jobProfiles.move_to_end(profile.id)
+        while len(_jobProfiles) > _jobProfileLimit:
+            _jobProfiles.popitem(last=False)
+
+def _registerJob(jobDesc):
+    """Compile a job description and keep it for lookup by id."""
+    profile = compileJobDescription(jobDesc)
+    _rememberJob(profile)
+    if _sharedJobs is not None:
+        _sharedJobs.put(profile.id, {'jobDesc': jobDesc})
+    return profile
+
+def _getJob(jobId):
+    with _jobProfilesLock:
+        profile = _jobProfiles.get(jobId)
+        if profile is not None:
+            _jobProfiles.move_to_end(jobId)
+            return profile
+    
+    #Registered through another process: recompile (its embedding is in the shared disk cache)
+    record = _sharedJobs.get(jobId) if _sharedJobs is not None else None
+    if record is None:
+        return None
+    profile = compileJobDescription(record['jobDesc'])
+    _rememberJob(profile)
+    return profile
+
+def _resolveJob():
+    """
+    The job to score against: a registered JobProfile when the form has jobId,
+    otherwise the raw jobDesc text. Returns (job, errorResponse).
+    """
+    jobId = request.form.get('jobId', '').strip()
+    if jobId:
+        profile = _getJob(jobId)
+        if profile is None:
+            return None, (jsonify({'error': 'Unknown job, register it again via /api/jobs'}), 404)
+        return profile, None
+    
+    if 'jobDesc' not in request.form:
+        return None, (jsonify({'error': 'No job description'}), 400)
+    jobDesc = request.form['jobDesc']
+    if not jobDesc.strip():
+        return None, (jsonify({'error': 'Job description is empty'}), 400)
+    return jobDesc, None
+
+def _wantsDetail():
+    """True when the client asked for per-requirement evidence (?detail=1 or a detail form field)."""
+    return request.args.get('detail', request.form.get('detail')) == '1'
+
+def _validateAnalyzeRequest():
+    """Check the resume upload. Returns an error response, or None if valid."""
+    if 'resume' not in request.files:
+        return jsonify({'error': 'No resume file'}), 400
+    
+    resumeFile = request.files['resume']
+    
+    if resumeFile.filename == '':
+        return jsonify({'error': 'No file selected'}), 400
+    
+    if not resumeFile.filename.lower().endswith('.pdf'):
+        return jsonify({'error': 'File must be PDF'}), 400
+    
+    return None
+
+@app.route('/api/jobs', methods=['POST'])
+def registerJob():
+    try:
+        jobDesc = request.form.get('jobDesc', '')
+        if not jobDesc.strip():
+            return jsonify({'error': 'Job description is empty'}), 400
+        
+        profile = _registerJob(jobDesc)
+        keywords, important = profile.keywords()
+        return jsonify({
+            'jobId': profile.id,
+            'keywords': sorted(keywords),
+            'categories': {catName: sorted(kws) for catName, kws in categorizeKeywords(important).items()}
+        }), 201
+    
+    except Exception as e:
+        #Ensure we always return valid JSON
+        return jsonify({'error': str(e)}), 500
+
+class AnalysisError(Exception):
+    """Problem with the uploaded input, reported to the client as a 400."""
+
+def _queueOcr(pdfBytes):
+    """
+    Queue OCR for an image-only PDF. Returns an ocr_pending body for the client to poll,
+    raises AnalysisError when OCR is unavailable or already found nothing.
+    """
+    ocrQueue = getOcrQueue()
+    if ocrQueue is None:
+        raise AnalysisError('No text in PDF')
+    
+    ocrId, ocrJob = ocrQueue.submit(pdfBytes)
+    if ocrJob['status'] == 'done':
+        raise AnalysisError('No text in PDF, even after OCR')
+    return {'status': 'ocr_pending', 'ocrId': ocrId}
+
+def _skipNoText(filename, pdfBytes):
+    """Skipped-file entry for an image-only upload, queueing OCR so a retry can include it."""
+    entry = {'filename': filename}
+    try:
+        entry['ocrId'] = _queueOcr(pdfBytes)['ocrId']
+        entry['error'] = 'No text in PDF yet, OCR queued'
+    except (AnalysisError, QueueFullError) as e:
+        entry['error'] = str(e)
+    return entry
+
+def _analyzePdf(job, pdfBytes, detail=False):
+    """
+    Parse and score one resume against a JobProfile or job text. Runs on a task worker for async requests.
+    With detail, the result also lists each job requirement with its best matching resume sentence.
+    """
+    resumeText = _extractPdfBytes(pdfBytes)
+    
+    #Image-only PDF: OCR runs in its own pool, the client retries once it's done
+    if not resumeText.strip():
+        return _queueOcr(pdfBytes)
+    
+    #Calculate match score
+    if isinstance(job, JobProfile):
+        score, matched, missing = scoreResume(job, resumeText)
+    else:
+        score, matched, missing = getMatchScore(job, resumeText)
+    
+    result = _buildResult(score, matched, missing)
+    if detail:
+        result['requirements'] = _buildExplanation(explainMatch(job, resumeText))
+    return result
+
 @app.route('/api/analyze', methods=['POST'])
 def analyze():
     try:
         #Validate inputs
-        if 'resume' not in request.files:
-            return jsonify({'error': 'No resume file'}), 400
-        if 'jobDesc' not in request.form:
-            return jsonify({'error': 'No job description'}), 400
+        error = _validateAnalyzeRequest()
+        if error:
+            return error
+        job, error = _resolveJob()
+        if error:
+            return error
         
-        resumeFile = request.files['resume']
-        jobDesc = request.form['jobDesc']
+        pdfBytes = _readUpload(request.files['resume'])
         
-        if resumeFile.filename == '':
-            return jsonify({'error': 'No file selected'}), 400
+        try:
+            result = _analyzePdf(job, pdfBytes, _wantsDetail())
+        except AnalysisError as e:
+            return jsonify({'error': str(e)}), 400
+        except QueueFullError:
+            response = jsonify({'error': 'Server busy, try again shortly'})
+            response.headers['Retry-After'] = '5'
+            return response, 429
         
-        if not resumeFile.filename.lower().endswith('.pdf'):
-            return jsonify({'error': 'File must be PDF'}), 400
+        if result.get('status') == 'ocr_pending':
+            response = jsonify(result)
+            response.headers['Location'] = f"/api/ocr/{result['ocrId']}"
+            return response, 202
         
-        if not jobDesc.strip():
-            return jsonify({'error': 'Job description is empty'}), 400
+        return jsonify(result)
+    
+    except Exception as e:
+        #Ensure we always return valid JSON
+        return jsonify({'error': str(e)}), 500
+
+#Worker pool for async analysis, started on first use
+_taskQueue = None
+_taskQueueLock = threading.Lock()
+
+def _getTaskQueue():
+    global _taskQueue
+    with _taskQueueLock:
+        if _taskQueue is None:
+            _taskQueue = TaskQueue(shared=sharedNamespace('tasks', taskResultTtl))
+            _taskQueue.start()
+        return _taskQueue
+
+@app.route('/api/analyze/async', methods=['POST'])
+def analyzeAsync():
+    try:
+        #Validate inputs
+        error = _validateAnalyzeRequest()
+        if error:
+            return error
+        job, error = _resolveJob()
+        if error:
+            return error
+        
+        pdfBytes = _readUpload(request.files['resume'])
         
-        #Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp:
-            resumeFile.save(temp.name)
-            tempPath = temp.name
+        try:
+            taskId = _getTaskQueue().submit(_analyzePdf, job, pdfBytes, _wantsDetail())
+        except QueueFullError:
+            response = jsonify({'error': 'Server busy, try again shortly'})
+            response.headers['Retry-After'] = '5'
+            return response, 429
+        
+        response = jsonify({'taskId': taskId, 'status': 'queued'})
+        response.headers['Location'] = f'/api/tasks/{taskId}'
+        return response, 202
+    
+    except Exception as e:
+        #Ensure we always return valid JSON
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/tasks/<taskId>', methods=['GET'])
+def getTask(taskId):
+    task = _getTaskQueue().get(taskId)
+    if task is None:
+        return jsonify({'error': 'Unknown task'}), 404
+    
+    body = {'taskId': taskId, 'status': task['status']}
+    if task['status'] == 'done':
+        body['result'] = task['result']
+    elif task['status'] == 'failed':
+        body['error'] = task['error']
+    return jsonify(body)
+
+@app.route('/api/tasks/<taskId>', methods=['DELETE'])
+def cancelTask(taskId):
+    taskQueue = _getTaskQueue()
+    if taskQueue.cancel(taskId):
+        return jsonify({'taskId': taskId, 'status': 'cancelled'})
+    
+    task = taskQueue.get(taskId)
+    if task is None:
+        return jsonify({'error': 'Unknown task'}), 404
+    return jsonify({'error': f"Task is already {task['status']}"}), 409
+
+@app.route('/api/ocr/<ocrId>', methods=['GET'])
+def getOcrJob(ocrId):
+    ocrQueue = getOcrQueue()
+    ocrJob = ocrQueue.get(ocrId) if ocrQueue else None
+    if ocrJob is None:
+        return jsonify({'error': 'Unknown OCR job'}), 404
+    
+    body = {'ocrId': ocrId, 'status': ocrJob['status']}
+    if ocrJob['status'] == 'done':
+        body['hasText'] = ocrJob['hasText']
+    elif ocrJob['status'] == 'failed':
+        body['error'] = ocrJob['error']
+    return jsonify(body)
+
+@app.route('/api/rank', methods=['POST'])
+def rank():
+    try:
+        #Validate inputs
+        resumeFiles = request.files.getlist('resumes')
+        if not resumeFiles:
+            return jsonify({'error': 'No resume files'}), 400
+        job, error = _resolveJob()
+        if error:
+            return error
         
         try:
-            #Extract text from PDF
-            resumeText = extractTextFromPdf(tempPath)
-            
+            topK = int(request.form.get('topK', 0)) or None
+            batchSize = int(request.form.get('batchSize', 32))
+        except ValueError:
+            return jsonify({'error': 'topK and batchSize must be integers'}), 400
+        if (topK is not None and topK < 0) or batchSize < 1:
+            return jsonify({'error': 'topK and batchSize must be positive'}), 400
+        
+        #Parse every upload, keeping failures out of the ranking
+        fileNames = []
+        resumeTexts = []
+        skipped = []
+        for resumeFile in resumeFiles:
+            if not resumeFile.filename.lower().endswith('.pdf'):
+                skipped.append({'filename': resumeFile.filename, 'error': 'File must be PDF'})
+                continue
+            try:
+                pdfBytes = _readUpload(resumeFile)
+                resumeText = _extractPdfBytes(pdfBytes, name=resumeFile.filename)
+            except Exception as e:
+                skipped.append({'filename': resumeFile.filename, 'error': str(e)})
+                continue
+            if not resumeText.strip():
+                skipped.append(_skipNoText(resumeFile.filename, pdfBytes))
+                continue
+            fileNames.append(resumeFile.filename)
+            resumeTexts.append(resumeText)
+        
+        ranked = rankResumes(job, resumeTexts, topK=topK, batchSize=batchSize)
+        
+        results = []
+        for position, (index, score, matched, missing) in enumerate(ranked, start=1):
+            result = _buildResult(score, matched, missing)
+            result['rank'] = position
+            result['filename'] = fileNames[index]
+            results.append(result)
+        
+        return jsonify({'total': len(resumeTexts), 'results': results, 'skipped': skipped})
+    
+    except Exception as e:
+        #Ensure we always return valid JSON
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/index/resumes', methods=['POST'])
+def indexResumes():
+    try:
+        resumeFiles = request.files.getlist('resumes')
+        if not resumeFiles:
+            return jsonify({'error': 'No resume files'}), 400
+        
+        #Parse every upload, id is the hash of the extracted text so re-uploads are skipped
+        items = []
+        skipped = []
+        for resumeFile in resumeFiles:
+            if not resumeFile.filename.lower().endswith('.pdf'):
+                skipped.append({'filename': resumeFile.filename, 'error': 'File must be PDF'})
+                continue
+            try:
+                pdfBytes = _readUpload(resumeFile)
+                resumeText = _extractPdfBytes(pdfBytes, name=resumeFile.filename)
+            except Exception as e:
+                skipped.append({'filename': resumeFile.filename, 'error': str(e)})
+                continue
             if not resumeText.strip():
-                return jsonify({'error': 'No text in PDF'}), 400
-            
-            #Calculate match score
-            score, matched, missing = getMatchScore(jobDesc, resumeText)
-            
-            #Categorize keywords
-            matchedCats = categorizeKeywords(matched)
-            missingCats = categorizeKeywords(missing)
-            
-            #Build response
-            result = {
-                'score': round(score * 100, 1),
-                'matched': sorted(list(matched)),
-                'missing': sorted(list(missing)),
-                'matchedCategories': {
-                    'languages': sorted(list(matchedCats['languages'])),
-                    'frameworks': sorted(list(matchedCats['frameworks'])),
-                    'tools': sorted(list(matchedCats['tools'])),
-                    'databases': sorted(list(matchedCats['databases'])),
-                    'other': sorted(list(matchedCats['other']))
-                },
-                'missingCategories': {
-                    'languages': sorted(list(missingCats['languages'])),
-                    'frameworks': sorted(list(missingCats['frameworks'])),
-                    'tools': sorted(list(missingCats['tools'])),
-                    'databases': sorted(list(missingCats['databases'])),
-                    'other': sorted(list(missingCats['other']))
-                }
-            }
-            
-            return jsonify(result)
-            
-        finally:
-            #Cleanup temp file
-            if os.path.exists(tempPath):
-                os.remove(tempPath)
+                skipped.append(_skipNoText(resumeFile.filename, pdfBytes))
+                continue
+            resumeId = hashlib.sha256(resumeText.encode('utf-8')).hexdigest()
+            items.append((resumeId, resumeText, resumeFile.filename))
+        
+        index = getIndex()
+        added = index.addMany(items)
+        
+        return jsonify({
+            'added': added,
+            'duplicates': len(items) - added,
+            'total': len(index),
+            'skipped': skipped
+        })
+    
+    except Exception as e:
+        #Ensure we always return valid JSON
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/index/query', methods=['POST'])
+def queryIndex():
+    try:
+        jobDesc = request.form.get('jobDesc', '')
+        if not jobDesc.strip():
+            return jsonify({'error': 'Job description is empty'}), 400
+        
+        try:
+            topK = int(request.form.get('topK', 10))
+        except ValueError:
+            return jsonify({'error': 'topK must be an integer'}), 400
+        if topK < 1:
+            return jsonify({'error': 'topK must be positive'}), 400
+        
+        index = getIndex()
+        results = []
+        for position, candidate in enumerate(index.query(jobDesc, topK=topK), start=1):
+            result = _buildResult(candidate['score'], candidate['matched'], candidate['missing'])
+            result['rank'] = position
+            result['id'] = candidate['id']
+            result['filename'] = candidate['name']
+            results.append(result)
+        
+        return jsonify({'total': len(index), 'results': results})
     
     except Exception as e:
         #Ensure we always return valid JSON
         return jsonify({'error': str(e)}), 500
 
 if __name__ == '__main__':
+    #The debug reloader's parent only watches files; its child (WERKZEUG_RUN_MAIN set) serves requests
+    if _warmupEnabled and os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        startWarmup()
     app.run(debug=True, port=5000)
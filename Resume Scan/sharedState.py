@@ -0,0 +1,76 @@
+import json
+import os
+import threading
+import time
+
+#Shared state config (override with environment variables)
+stateDir = os.environ.get('SHARED_STATE_DIR') or None  #Unset = single process, state stays in memory
+pruneInterval = 60  #Seconds between sweeps for expired records
+
+class SharedState:
+    """
+    Small JSON records in a directory every server process can read.
+
+    Lets one worker process answer for work another worker owns (async task
+    status, OCR job status, registered job descriptions) when the server runs
+    as several processes. One file per key, written atomically; records older
+    than maxAge seconds are deleted.
+    """
+
+    def __init__(self, directory, maxAge):
+        self.directory = directory
+        self.maxAge = maxAge
+        self._lastPrune = 0.0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        #Keys come from URLs, so only plain ids may touch the filesystem
+        if not key or not key.isalnum():
+            return None
+        return os.path.join(self.directory, key + '.json')
+
+    def put(self, key, record):
+        """Write a record for key, replacing any previous one."""
+        path = self._path(key)
+        if path is None:
+            raise ValueError(f"Invalid shared state key: {key!r}")
+        tempPath = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tempPath, 'w', encoding='utf-8') as f:
+            json.dump(record, f)
+        os.replace(tempPath, path)
+        self._prune()
+
+    def get(self, key):
+        """The record for key, or None if unknown or expired."""
+        path = self._path(key)
+        if path is None:
+            return None
+        try:
+            if os.path.getmtime(path) < time.time() - self.maxAge:
+                return None
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _prune(self):
+        now = time.time()
+        with self._lock:
+            if now - self._lastPrune < pruneInterval:
+                return
+            self._lastPrune = now
+        cutoff = now - self.maxAge
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+
+def sharedNamespace(name, maxAge):
+    """A SharedState under stateDir/name, or None when the server runs as a single process."""
+    if not stateDir:
+        return None
+    return SharedState(os.path.join(stateDir, name), maxAge)
@@ -0,0 +1,158 @@
+import os
+import queue
+import threading
+import time
+import uuid
+
+#Queue config (override with environment variables)
+workerCount = int(os.environ.get('ANALYZE_WORKERS', 2))
+maxPending = int(os.environ.get('ANALYZE_QUEUE_SIZE', 32))
+resultTtl = int(os.environ.get('ANALYZE_RESULT_TTL', 600))  #Seconds finished tasks stay pollable
+
+class QueueFullError(Exception):
+    """Raised by submit() when the queue is at capacity."""
+
+class TaskQueue:
+    """
+    Bounded in-process task queue drained by a pool of worker threads.
+
+    Task status moves queued -> running -> done | failed, or queued -> cancelled.
+    Finished tasks are kept for resultTtl seconds so clients can poll for them.
+
+    With a SharedState (see sharedState.py), every status change is also
+    published there, so other server processes can report on and cancel
+    this process's tasks.
+    """
+
+    def __init__(self, workers=workerCount, maxPending=maxPending, resultTtl=resultTtl, shared=None):
+        self.workers = workers
+        self.resultTtl = resultTtl
+        self.shared = shared
+        self._pending = queue.Queue(maxsize=maxPending)
+        self._tasks = {}
+        self._lock = threading.Lock()
+        self._threads = []
+        self._running = 0
+
+    def start(self):
+        """Start the worker threads (idempotent)."""
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f"task-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, fn, *args):
+        """Queue fn(*args). Returns the task id, raises QueueFullError when full."""
+        self._prune()
+        taskId = uuid.uuid4().hex
+        task = {
+            'id': taskId,
+            'status': 'queued',
+            'result': None,
+            'error': None,
+            'submitted': time.time(),
+            'finished': None
+        }
+        with self._lock:
+            self._tasks[taskId] = task
+        #Publish before queueing, a fast worker's later updates must not be overwritten
+        self._publish(dict(task))
+        try:
+            self._pending.put_nowait((taskId, fn, args))
+        except queue.Full:
+            with self._lock:
+                del self._tasks[taskId]
+            raise QueueFullError(f"Queue is full ({self._pending.maxsize} pending tasks)")
+        return taskId
+
+    def _publish(self, task):
+        if self.shared is None:
+            return
+        try:
+            self.shared.put(task['id'], {key: task[key] for key in ('status', 'result', 'error', 'finished')})
+        except OSError:
+            pass  #Other processes just won't see this update
+
+    def get(self, taskId):
+        """Snapshot of a task's state, or None if unknown or expired."""
+        self._prune()
+        with self._lock:
+            task = self._tasks.get(taskId)
+            if task is not None:
+                return dict(task)
+        #Owned by another server process
+        return self.shared.get(taskId) if self.shared is not None else None
+
+    def cancel(self, taskId):
+        """Cancel a task that hasn't started yet. Returns True if it was cancelled."""
+        with self._lock:
+            task = self._tasks.get(taskId)
+            if task is not None:
+                if task['status'] != 'queued':
+                    return False
+                #Worker skips it when it comes off the queue
+                task['status'] = 'cancelled'
+                task['finished'] = time.time()
+                snapshot = dict(task)
+        if task is not None:
+            self._publish(snapshot)
+            return True
+
+        #Another process owns it and checks the shared record before starting it (best effort)
+        record = self.shared.get(taskId) if self.shared is not None else None
+        if record is None or record['status'] != 'queued':
+            return False
+        record.update(status='cancelled', finished=time.time())
+        self.shared.put(taskId, record)
+        return True
+
+    def depth(self):
+        """Number of tasks waiting for a worker."""
+        return self._pending.qsize()
+
+    def running(self):
+        """Number of tasks currently being processed."""
+        with self._lock:
+            return self._running
+
+    def _work(self):
+        while True:
+            taskId, fn, args = self._pending.get()
+            if self.shared is not None:
+                record = self.shared.get(taskId)
+                if record is not None and record['status'] == 'cancelled':
+                    self.cancel(taskId)
+            with self._lock:
+                task = self._tasks.get(taskId)
+                if task is None or task['status'] != 'queued':
+                    continue
+                task['status'] = 'running'
+                self._running += 1
+                snapshot = dict(task)
+            self._publish(snapshot)
+
+            try:
+                result = fn(*args)
+                update = {'status': 'done', 'result': result}
+            except Exception as e:
+                update = {'status': 'failed', 'error': str(e)}
+
+            with self._lock:
+                task.update(update)
+                task['finished'] = time.time()
+                self._running -= 1
+                snapshot = dict(task)
+            self._publish(snapshot)
+
+    def _prune(self):
+        cutoff = time.time() - self.resultTtl
+        with self._lock:
+            expired = [
+                taskId for taskId, task in self._tasks.items()
+                if task['finished'] is not None and task['finished'] < cutoff
+            ]
+            for taskId in expired:
+                del self._tasks[taskId]
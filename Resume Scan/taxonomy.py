@@ -0,0 +1,167 @@
+import hashlib
+import json
+import os
+import pickle
+import sys
+import threading
+import time
+from types import MappingProxyType
+from keywordEngine import KeywordEngine
+
+#Taxonomy config (override with environment variables)
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+taxonomyDir = os.environ.get('TAXONOMY_DIR', os.path.join(_BASE_DIR, 'taxonomy'))
+indexCacheDir = os.environ.get('TAXONOMY_INDEX_CACHE_DIR', os.path.join(_BASE_DIR, '.cache', 'taxonomy'))
+reloadInterval = float(os.environ.get('TAXONOMY_RELOAD_SECONDS', 2.0))
+minKeywordLen = 4
+
+#Bump when KeywordEngine's internals change so stale pickles are rebuilt
+_indexFormat = 1
+
+_extensions = ('.json', '.yaml', '.yml')
+
+class Taxonomy:
+    """Frozen, compiled taxonomy: category/stopword/alias tables plus the keyword engine built from them."""
+
+    def __init__(self, categories, stopwords, aliases, fingerprint):
+        self.categories = MappingProxyType({name: frozenset(terms) for name, terms in categories.items()})
+        self.stopwords = frozenset(stopwords)
+        self.aliases = MappingProxyType(dict(aliases))
+        self.fingerprint = fingerprint
+        self.engine = KeywordEngine(self.categories, self.stopwords, minKeywordLen, aliases=self.aliases)
+
+    def __getstate__(self):
+        #MappingProxyType can't be pickled, store plain dicts
+        state = self.__dict__.copy()
+        state['categories'] = dict(self.categories)
+        state['aliases'] = dict(self.aliases)
+        return state
+
+    def __setstate__(self, state):
+        state['categories'] = MappingProxyType(state['categories'])
+        state['aliases'] = MappingProxyType(state['aliases'])
+        self.__dict__.update(state)
+
+def _taxonomyFiles(directory):
+    return sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name.lower().endswith(_extensions)
+    )
+
+def _statSignature(directory):
+    """Cheap change detector: file names, sizes and modification times."""
+    try:
+        files = _taxonomyFiles(directory)
+    except OSError:
+        return None
+    signature = []
+    for path in files:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        signature.append((path, stat.st_size, stat.st_mtime_ns))
+    return tuple(signature)
+
+def _parseFile(path, raw):
+    if path.lower().endswith('.json'):
+        return json.loads(raw)
+    try:
+        import yaml
+    except ImportError:
+        raise RuntimeError(f"PyYAML is required to load {path} (pip install pyyaml)")
+    return yaml.safe_load(raw) or {}
+
+def _normalizeTerm(term):
+    return " ".join(str(term).lower().split())
+
+def loadTaxonomy(directory=taxonomyDir):
+    """
+    Load and merge every taxonomy file in directory, in filename order.
+
+    Each file may define any of:
+    - categories: {name: [terms]} (merged per category, first category listing a term wins)
+    - aliases: {alias: term} (e.g. k8s -> kubernetes)
+    - stopwords: [words]
+
+    The compiled result is pickled under indexCacheDir keyed by file contents,
+    so an unchanged taxonomy is not rebuilt on the next startup.
+    """
+    contents = []
+    digest = hashlib.sha256(f"format={_indexFormat};minKeywordLen={minKeywordLen}".encode())
+    for path in _taxonomyFiles(directory):
+        with open(path, 'rb') as f:
+            raw = f.read()
+        contents.append((path, raw))
+        digest.update(os.path.basename(path).encode('utf-8') + b'\0' + raw + b'\0')
+    fingerprint = digest.hexdigest()
+
+    cachePath = os.path.join(indexCacheDir, fingerprint + '.pickle') if indexCacheDir else None
+    if cachePath and os.path.exists(cachePath):
+        try:
+            with open(cachePath, 'rb') as f:
+                return pickle.load(f)
+        except Exception:
+            pass  #Corrupt or incompatible pickle, rebuild below
+
+    categories = {}
+    aliases = {}
+    stopwords = set()
+    for path, raw in contents:
+        data = _parseFile(path, raw)
+        if not isinstance(data, dict):
+            raise ValueError(f"Taxonomy file {path} must contain a mapping")
+        for catName, terms in (data.get('categories') or {}).items():
+            if catName == 'other':
+                raise ValueError(f"Taxonomy file {path}: 'other' is reserved for uncategorized keywords")
+            categories.setdefault(catName, set()).update(_normalizeTerm(t) for t in terms)
+        for alias, term in (data.get('aliases') or {}).items():
+            aliases[_normalizeTerm(alias)] = _normalizeTerm(term)
+        stopwords.update(_normalizeTerm(w) for w in data.get('stopwords') or ())
+
+    taxonomy = Taxonomy(categories, stopwords, aliases, fingerprint)
+
+    if cachePath:
+        try:
+            os.makedirs(indexCacheDir, exist_ok=True)
+            tempPath = f"{cachePath}.{os.getpid()}.tmp"
+            with open(tempPath, 'wb') as f:
+                pickle.dump(taxonomy, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tempPath, cachePath)
+        except OSError:
+            pass  #Prebuilt index is an optimization only
+
+    return taxonomy
+
+#Current taxonomy, swapped atomically on reload
+_taxonomy = None
+_signature = None
+_lastCheck = 0.0
+_lock = threading.Lock()
+
+def getTaxonomy():
+    """
+    Return the current taxonomy, loading it on first use.
+    Files are re-checked at most every reloadInterval seconds and reloaded when they change.
+    """
+    global _taxonomy, _signature, _lastCheck
+    now = time.monotonic()
+    if _taxonomy is not None and now - _lastCheck < reloadInterval:
+        return _taxonomy
+
+    with _lock:
+        if _taxonomy is not None and now - _lastCheck < reloadInterval:
+            return _taxonomy
+        _lastCheck = now
+        signature = _statSignature(taxonomyDir)
+        if _taxonomy is None or signature != _signature:
+            try:
+                _taxonomy = loadTaxonomy(taxonomyDir)
+                _signature = signature
+            except Exception as e:
+                if _taxonomy is None:
+                    raise
+                #Keep serving the last good taxonomy until the files are fixed
+                print(f"TAXONOMY_RELOAD_ERROR: {e}", file=sys.stderr)
+                _signature = signature
+        return _taxonomy
@@ -18,6 +18,135 @@ except Exception as e:
     print(f"✗ resumeParser import failed: {e}")
     sys.exit(1)
 
+#Offline checks use the benchmark's hashed bag-of-words model and a memory-only embedding cache
+import os
+import tempfile
+import matcher
+from benchmark import StubModel
+from embeddingCache import EmbeddingCache
+
+stubResumes = {
+    'a': "Python developer building Django REST APIs backed by PostgreSQL and Redis",
+    'b': "Registered nurse with six years of ICU patient care and triage experience",
+    'c': "Java engineer working on Spring Boot microservices with Kafka and Docker",
+    'd': "Frontend developer using React, TypeScript and CSS for accessible web apps"
+}
+
+def useStubModel():
+    """Swap in the stub model; returns a function that restores the real one."""
+    saved = matcher._model, matcher._embeddingCache
+    matcher._model = StubModel()
+    matcher._embeddingCache = EmbeddingCache(directory=None, maxMemoryEntries=0)
+    def restore():
+        matcher._model, matcher._embeddingCache = saved
+    return restore
+
+print("\nTesting resume index crash recovery (stub model)...")
+restoreModel = useStubModel()
+try:
+    from resumeIndex import ResumeIndex
+    with tempfile.TemporaryDirectory() as indexDir:
+        index = ResumeIndex(indexDir)
+        assert index.addMany([(rid, text, f"{rid}.pdf") for rid, text in stubResumes.items()]) == 4
+        assert index.addMany([('a', stubResumes['a'], 'a.pdf')]) == 0, "duplicate id was added"
+        
+        #Simulate a crash halfway through writing the last metadata line
+        metaPath = os.path.join(indexDir, 'meta.jsonl')
+        with open(metaPath, 'r+b') as f:
+            f.truncate(os.path.getsize(metaPath) - 10)
+        
+        index = ResumeIndex(indexDir)
+        assert len(index) == 3 and 'c' in index and 'd' not in index, f"reopened with {len(index)} rows"
+        top = index.query(stubResumes['c'], topK=1)[0]
+        assert (top['id'], top['name']) == ('c', 'c.pdf'), top
+        
+        #Appending again replaces the torn row and keeps rows aligned with their metadata
+        assert index.add('d', stubResumes['d'], 'd.pdf')
+        assert index.query(stubResumes['d'], topK=1)[0]['id'] == 'd'
+        index = ResumeIndex(indexDir)
+        assert len(index) == 4
+        for rid, text in stubResumes.items():
+            top = index.query(text, topK=1)[0]
+            assert (top['id'], top['name']) == (rid, f"{rid}.pdf"), (rid, top)
+        
+        #Two handles on one directory, like two server workers: each sees the other's rows
+        other = ResumeIndex(indexDir)
+        assert other.add('e', "Data engineer running Spark and Airflow pipelines on GCP", 'e.pdf')
+        assert index.add('f', "Mobile developer shipping Swift and Kotlin apps", 'f.pdf')
+        assert not other.add('f', "Mobile developer shipping Swift and Kotlin apps", 'f.pdf'), "duplicate id was added"
+        assert other.query("Mobile developer shipping Swift and Kotlin apps", topK=1)[0]['name'] == 'f.pdf'
+        assert len(index) == len(other) == len(ResumeIndex(indexDir)) == 6
+        del index, other, top
+    print("✓ Torn append dropped on reopen, rows and metadata still aligned across handles")
+except Exception as e:
+    print(f"✗ Resume index recovery failed: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
+finally:
+    restoreModel()
+
+print("\nTesting score store re-scoring (stub model)...")
+restoreModel = useStubModel()
+import taxonomy
+savedTaxonomy = taxonomy.taxonomyDir, taxonomy.indexCacheDir
+savedWeights = matcher.semanticWeight, matcher.keywordWeight
+try:
+    import json
+    import shutil
+    from matcher import compileJobDescription, scoreComponents
+    from scoreStore import ScoreStore
+    jobDesc = "Golang and Python engineer for k8s services on AWS. Django and PostgreSQL a plus."
+    resumes = dict(stubResumes, e="Backend engineer writing golang and python services for k8s clusters",
+                   f="Backend developer using postgres and python")
+    
+    def checkParity(store, when):
+        for result in store.rank():
+            expected = getMatchScore(jobDesc, resumes[result['id']])[0]
+            assert abs(result['score'] - expected) < 1e-5, f"{when}: {result['id']} {result['score']:.4f} != {expected:.4f}"
+    
+    with tempfile.TemporaryDirectory() as workDir:
+        store = ScoreStore(os.path.join(workDir, 'store'), jobDesc=jobDesc)
+        semanticScores, _ = scoreComponents(compileJobDescription(jobDesc), list(resumes.values()))
+        store.addMany(list(resumes)[:2], list(resumes.values())[:2], semanticScores[:2])
+        checkParity(store, "first rows")
+        #Rows added after presence.npz was written are extracted on top of it
+        store = ScoreStore(store.directory)
+        store.addMany(list(resumes), list(resumes.values()), semanticScores)
+        checkParity(ScoreStore(store.directory), "as stored")
+        
+        matcher.semanticWeight, matcher.keywordWeight = 0.3, 0.7
+        checkParity(ScoreStore(store.directory), "after weight change")
+        matcher.semanticWeight, matcher.keywordWeight = savedWeights
+        
+        #Retarget an alias (golang becomes its own language instead of meaning go) and drop one
+        editedDir = os.path.join(workDir, 'taxonomy')
+        shutil.copytree(taxonomy.taxonomyDir, editedDir)
+        skillsPath = os.path.join(editedDir, 'skills.json')
+        with open(skillsPath) as f:
+            skills = json.load(f)
+        del skills['aliases']['golang']
+        del skills['aliases']['postgres']
+        skills['categories']['languages'].append('golang')
+        with open(skillsPath, 'w') as f:
+            json.dump(skills, f)
+        taxonomy.taxonomyDir, taxonomy.indexCacheDir = editedDir, None
+        taxonomy._lastCheck = 0.0
+        assert 'golang' in matcher.extractKeywords(jobDesc)
+        checkParity(store, "after taxonomy edit")
+        checkParity(ScoreStore(store.directory), "after taxonomy edit, reopened")
+    print("✓ Re-scored store matches getMatchScore after weight and taxonomy changes")
+except Exception as e:
+    print(f"✗ Score store re-scoring failed: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
+finally:
+    matcher.semanticWeight, matcher.keywordWeight = savedWeights
+    taxonomy.taxonomyDir, taxonomy.indexCacheDir = savedTaxonomy
+    taxonomy._lastCheck = 0.0
+    restoreModel()
+
 print("\nTesting model loading...")
 try:
     model = loadModel()
@@ -56,6 +185,36 @@ except Exception as e:
     traceback.print_exc()
     sys.exit(1)
 
+print("\nTesting punctuated skill extraction...")
+try:
+    from matcher import extractKeywords
+    keywords = extractKeywords("Skills: C++, C#, .NET, ASP.NET, Node.js and scikit-learn. Python.")
+    expected = {'c++', 'c#', '.net', 'asp.net', 'node.js', 'scikit-learn', 'python'}
+    assert expected <= keywords, f"missing {sorted(expected - keywords)}"
+    assert categorizeKeywords(keywords)['languages'] >= {'c++', 'c#', 'python'}
+    print(f"✓ Extracted {len(keywords)} keywords including {sorted(expected)}")
+except Exception as e:
+    print(f"✗ Keyword extraction failed: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
+
+print("\nTesting requirement sentence splitting...")
+try:
+    from matcher import splitSentences
+    sentences = splitSentences("Jane Doe • Built REST APIs in Python and Flask. ▪ Deployed services with Docker on AWS - Led a team of four engineers")
+    assert sentences == [
+        "Built REST APIs in Python and Flask.",
+        "Deployed services with Docker on AWS",
+        "Led a team of four engineers"
+    ], sentences
+    print(f"✓ Split into {len(sentences)} sentences")
+except Exception as e:
+    print(f"✗ Sentence splitting failed: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
+
 print("\nAll tests passed!")
 print("\nExample matched keywords:", sorted(list(matched))[:10])
 print("Example missing keywords:", sorted(list(missing))[:10])
\ No newline at end of file
@@ -0,0 +1,40 @@
+import hashlib
+import os
+import zlib
+from embeddingCache import EmbeddingCache
+
+#Cache config (override with environment variables)
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+cacheDir = os.environ.get('TEXT_CACHE_DIR', os.path.join(_BASE_DIR, '.cache', 'text'))
+maxMemoryEntries = int(os.environ.get('TEXT_CACHE_MEMORY_ENTRIES', 128))
+maxDiskBytes = int(os.environ.get('TEXT_CACHE_DISK_MB', 256)) * 1024 * 1024
+
+def textKey(data, maxPages, maxChars):
+    """Content address for extracted text: hash of the PDF bytes plus the extraction limits."""
+    digest = hashlib.sha256(f"{maxPages}:{maxChars}\n".encode('utf-8'))
+    digest.update(data)
+    return digest.hexdigest()
+
+class TextCache(EmbeddingCache):
+    """
+    Extracted PDF text keyed by textKey, with the same memory LRU and bounded
+    disk store as the embedding cache. Text is zlib-compressed on disk.
+    """
+
+    suffix = '.txt.z'
+
+    def __init__(self, directory=cacheDir, maxMemoryEntries=maxMemoryEntries, maxDiskBytes=maxDiskBytes):
+        super().__init__(directory, maxMemoryEntries, maxDiskBytes)
+
+    def _prepare(self, value):
+        return value
+
+    def _read(self, path):
+        with open(path, 'rb') as f:
+            try:
+                return zlib.decompress(f.read()).decode('utf-8')
+            except zlib.error as e:
+                raise ValueError(f"Corrupt text cache entry {path}: {e}")
+
+    def _write(self, f, value):
+        f.write(zlib.compress(value.encode('utf-8'), 6))
@@ -3,6 +3,7 @@ let uploadedFile = null;
 let resultsData = null;
 let currentMatchedTab = 'all';
 let currentMissingTab = 'all';
+let registeredJob = null; //{text, jobId} of the last job description sent to /api/jobs
 
 //Initialize
 document.addEventListener('DOMContentLoaded', function() {
@@ -120,11 +121,6 @@ async function analyze() {
         return;
     }
     
-    //Prepare form data
-    const formData = new FormData();
-    formData.append('jobDesc', jobDesc);
-    formData.append('resume', uploadedFile);
-    
     //Show loading
     document.getElementById('analyzeBtn').disabled = true;
     document.getElementById('loading').style.display = 'flex';
@@ -132,27 +128,40 @@ async function analyze() {
     document.getElementById('error').style.display = 'none';
     
     try {
-        const response = await fetch('/api/analyze', {
-            method: 'POST',
-            body: formData
-        });
+        let response = await submitAnalysis(jobDesc);
+        
+        //Server forgot the job (restart or eviction), register it again
+        if (response.status === 404) {
+            registeredJob = null;
+            response = await submitAnalysis(jobDesc);
+        }
+        
+        if (response.status === 429) {
+            throw new Error('Server is busy, please try again in a few seconds');
+        }
         
         //Check if response is ok before parsing JSON
         if (!response.ok) {
-            let errorMsg = 'Analysis failed';
-            try {
-                const data = await response.json();
-                errorMsg = data.error || errorMsg;
-            } catch (e) {
-                //Response is not JSON, might be HTML error page
-                const text = await response.text();
-                console.error('Server error response:', text);
-                errorMsg = 'Server error - check console for details';
-            }
-            throw new Error(errorMsg);
+            throw new Error(await readError(response, 'Analysis failed'));
         }
         
-        const data = await response.json();
+        const task = await response.json();
+        
+        //Wait for a worker to finish the analysis
+        let data = await pollTask(task.taskId);
+        
+        //Scanned PDF: wait for OCR, then analyze again (the OCR text is cached by then)
+        if (data.status === 'ocr_pending') {
+            await pollOcr(data.ocrId);
+            const retry = await submitAnalysis(jobDesc);
+            if (!retry.ok) {
+                throw new Error(await readError(retry, 'Analysis failed'));
+            }
+            data = await pollTask((await retry.json()).taskId);
+            if (data.status === 'ocr_pending') {
+                throw new Error('No text could be read from this PDF');
+            }
+        }
         
         //Store results
         resultsData = data;
@@ -165,6 +174,101 @@ async function analyze() {
     } finally {
         document.getElementById('analyzeBtn').disabled = false;
         document.getElementById('loading').style.display = 'none';
+        document.getElementById('loadingText').textContent = 'Analyzing...';
+    }
+}
+
+//Register the job description once, reuse its id while the text is unchanged
+async function getJobId(jobDesc) {
+    if (registeredJob && registeredJob.text === jobDesc) {
+        return registeredJob.jobId;
+    }
+    
+    const formData = new FormData();
+    formData.append('jobDesc', jobDesc);
+    const response = await fetch('/api/jobs', {
+        method: 'POST',
+        body: formData
+    });
+    if (!response.ok) {
+        throw new Error(await readError(response, 'Could not process job description'));
+    }
+    
+    const job = await response.json();
+    registeredJob = {text: jobDesc, jobId: job.jobId};
+    return job.jobId;
+}
+
+async function submitAnalysis(jobDesc) {
+    const formData = new FormData();
+    formData.append('jobId', await getJobId(jobDesc));
+    formData.append('resume', uploadedFile);
+    
+    return fetch('/api/analyze/async?detail=1', {
+        method: 'POST',
+        body: formData
+    });
+}
+
+async function readError(response, fallback) {
+    try {
+        const data = await response.json();
+        return data.error || fallback;
+    } catch (e) {
+        //Response is not JSON, might be HTML error page
+        const text = await response.text();
+        console.error('Server error response:', text);
+        return 'Server error - check console for details';
+    }
+}
+
+//Poll an async analysis task until it finishes, returns the result
+async function pollTask(taskId) {
+    const pollInterval = 500; //ms
+    const loadingText = document.getElementById('loadingText');
+    
+    while (true) {
+        const response = await fetch(`/api/tasks/${taskId}`);
+        if (!response.ok) {
+            throw new Error(await readError(response, 'Analysis failed'));
+        }
+        
+        const task = await response.json();
+        if (task.status === 'done') {
+            return task.result;
+        }
+        if (task.status === 'failed' || task.status === 'cancelled') {
+            throw new Error(task.error || 'Analysis ' + task.status);
+        }
+        
+        loadingText.textContent = task.status === 'queued' ? 'Waiting in queue...' : 'Analyzing...';
+        await new Promise(resolve => setTimeout(resolve, pollInterval));
+    }
+}
+
+//Poll an OCR job for a scanned PDF until it finishes
+async function pollOcr(ocrId) {
+    const pollInterval = 1000; //ms
+    document.getElementById('loadingText').textContent = 'Scanned PDF, running OCR...';
+    
+    while (true) {
+        const response = await fetch(`/api/ocr/${ocrId}`);
+        if (!response.ok) {
+            throw new Error(await readError(response, 'OCR failed'));
+        }
+        
+        const job = await response.json();
+        if (job.status === 'done') {
+            if (!job.hasText) {
+                throw new Error('No text could be read from this PDF, even with OCR');
+            }
+            return;
+        }
+        if (job.status === 'failed') {
+            throw new Error(job.error || 'OCR failed');
+        }
+        
+        await new Promise(resolve => setTimeout(resolve, pollInterval));
     }
 }
 
@@ -202,6 +306,9 @@ function displayResults(data) {
     currentMissingTab = 'all';
     displayKeywords('missing', data.missing, 'all');
     
+    //Display per-requirement evidence
+    displayRequirements(data.requirements || []);
+    
     //Show results section
     document.getElementById('results').style.display = 'block';
     
@@ -233,6 +340,47 @@ function displayKeywords(type, keywords, category) {
     }
 }
 
+function displayRequirements(requirements) {
+    const section = document.getElementById('requirementsSection');
+    const content = document.getElementById('requirementsContent');
+    content.innerHTML = '';
+    
+    if (requirements.length === 0) {
+        section.style.display = 'none';
+        return;
+    }
+    
+    //Built with textContent, evidence is text from the uploaded PDF
+    requirements.forEach(item => {
+        const row = document.createElement('div');
+        row.className = 'requirement';
+        
+        const header = document.createElement('div');
+        header.className = 'requirement-header';
+        const text = document.createElement('span');
+        text.className = 'requirement-text';
+        text.textContent = item.requirement;
+        const score = document.createElement('span');
+        score.className = 'requirement-score ' + (item.score >= 60 ? 'strong' : item.score >= 40 ? 'moderate' : 'weak');
+        score.textContent = item.score + '%';
+        header.append(text, score);
+        
+        const evidence = document.createElement('div');
+        evidence.className = 'requirement-evidence';
+        evidence.textContent = item.evidence;
+        row.append(header, evidence);
+        
+        if (item.missing.length > 0) {
+            const missing = document.createElement('div');
+            missing.className = 'requirement-missing';
+            missing.textContent = 'Not found in resume: ' + item.missing.join(', ');
+            row.append(missing);
+        }
+        content.append(row);
+    });
+    section.style.display = 'block';
+}
+
 function switchTab(type, category) {
     //Update tab buttons
     const parentSection = document.querySelector(`#${type}Content`).closest('.keywords-section');
@@ -253,6 +401,10 @@ function switchTab(type, category) {
 function downloadResults() {
     if (!resultsData) return;
     
+    const requirements = (resultsData.requirements || [])
+        .map(item => `- ${item.requirement}\n  ${item.score}%: ${item.evidence}`)
+        .join('\n');
+    
     const text = `RESUME MATCH REPORT
 ${'='.repeat(50)}
 Match Score: ${resultsData.score}%
@@ -264,7 +416,10 @@ ${resultsData.matched.join(', ')}
 
 MISSING KEYWORDS (${resultsData.missing.length}):
 ${resultsData.missing.join(', ')}
-`;
+${requirements ? `
+REQUIREMENT EVIDENCE:
+${requirements}
+` : ''}`;
     
     const blob = new Blob([text], { type: 'text/plain' });
     const url = URL.createObjectURL(blob);